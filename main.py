@@ -3,8 +3,9 @@ import argparse
 import json
 import os
 import time
-from parsers.lube_ozon_review_parser import OzonReviewParser
+from parsers.lube_ozon_review_parser import OzonReviewParser, parse_urls
 from src.utils.logger import log_info, log_error
+from src.utils.config import MAX_CONCURRENT_PRODUCTS
 
 def parse_args():
     """Парсинг аргументов командной строки"""
@@ -22,6 +23,19 @@ def parse_args():
         help="Путь к файлу со списком URL товаров (по одному URL на строку)"
     )
     
+    parser.add_argument(
+        "--workers", "-w",
+        type=int,
+        default=MAX_CONCURRENT_PRODUCTS,
+        help="Количество товаров, обрабатываемых параллельно (1 - последовательный парсинг)"
+    )
+    
+    parser.add_argument(
+        "--processes", "-p",
+        action="store_true",
+        help="Запускать параллельные обработчики в отдельных процессах вместо потоков"
+    )
+    
     return parser.parse_args()
 
 def read_urls_from_file(file_path):
@@ -60,10 +74,15 @@ def main():
     log_info(f"Начинаем парсинг отзывов для {len(urls)} товаров")
     start_time = time.time()
     
-    # Создаем парсер и запускаем парсинг
-    parser = OzonReviewParser()
+    # Создаем парсер и запускаем парсинг (браузер закрывается при выходе из блока with)
     try:
-        results = parser.parse_multiple_products(urls)
+        if args.workers > 1 and len(urls) > 1 and args.processes:
+            results = parse_urls(urls, workers=args.workers)
+        elif args.workers > 1 and len(urls) > 1:
+            results = OzonReviewParser.parse_many(urls, max_concurrency=args.workers)
+        else:
+            with OzonReviewParser() as parser:
+                results = parser.parse_multiple_products(urls, concurrency=args.workers)
         
         # Выводим статистику
         total_reviews = sum(results.values())
@@ -83,8 +102,6 @@ def main():
     except Exception as e:
         log_error(f"Ошибка при выполнении парсинга: {e}", exc_info=True)
         return 1
-    finally:
-        parser.close()
     
     elapsed_time = time.time() - start_time
     log_info(f"Общее время выполнения: {elapsed_time:.2f} секунд")
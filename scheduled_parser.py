@@ -122,46 +122,44 @@ def main(parser_type, debug_mode=False, force_full=False):
         
     all_results = {}
     try:
-        # Обрабатываем каждый URL отдельно с его настройками
-        for url, max_reviews, incremental in parsed_data:
-            # Если включен принудительный полный режим, игнорируем настройки инкрементного режима
-            if force_full:
-                incremental = False
+        # Браузер запускается один раз и закрывается при выходе из блока with
+        with parser_instance:
+            # Обрабатываем каждый URL отдельно с его настройками
+            for url, max_reviews, incremental in parsed_data:
+                # Если включен принудительный полный режим, игнорируем настройки инкрементного режима
+                if force_full:
+                    incremental = False
+                    
+                # Используем глобальные настройки, если параметр не указан явно
+                if incremental is None:
+                    incremental = INCREMENTAL_PARSING
+                    
+                if max_reviews is None:
+                    max_reviews = MAX_REVIEWS_PER_PRODUCT
+                    
+                log_info(f"Парсинг URL: {url}")
+                log_info(f"  Режим: {'инкрементный' if incremental else 'полный'}")
+                log_info(f"  Максимальное количество отзывов: {max_reviews}")
                 
-            # Используем глобальные настройки, если параметр не указан явно
-            if incremental is None:
-                incremental = INCREMENTAL_PARSING
-                
-            if max_reviews is None:
-                max_reviews = MAX_REVIEWS_PER_PRODUCT
-                
-            log_info(f"Парсинг URL: {url}")
-            log_info(f"  Режим: {'инкрементный' if incremental else 'полный'}")
-            log_info(f"  Максимальное количество отзывов: {max_reviews}")
+                try:
+                    # Используем созданный экземпляр парсера
+                    reviews = parser_instance.parse_product_reviews(url, max_reviews, incremental)
+                    all_results[url] = len(reviews)
+                    log_info(f"  Собрано отзывов: {len(reviews)}")
+                except Exception as e:
+                    log_error(f"  Ошибка при парсинге URL {url}: {e}")
+                    all_results[url] = 0
+                    
+                # Небольшая пауза между запросами к разным товарам
+                time.sleep(5)
+            
+            # Выводим общую статистику
+            total_reviews = sum(all_results.values())
+            log_info(f"Парсинг завершен. Всего собрано {total_reviews} отзывов со всех товаров")
             
-            try:
-                # Используем созданный экземпляр парсера
-                reviews = parser_instance.parse_product_reviews(url, max_reviews, incremental)
-                all_results[url] = len(reviews)
-                log_info(f"  Собрано отзывов: {len(reviews)}")
-            except Exception as e:
-                log_error(f"  Ошибка при парсинге URL {url}: {e}")
-                all_results[url] = 0
-                
-            # Небольшая пауза между запросами к разным товарам
-            time.sleep(5)
-        
-        # Выводим общую статистику
-        total_reviews = sum(all_results.values())
-        log_info(f"Парсинг завершен. Всего собрано {total_reviews} отзывов со всех товаров")
-        
     except Exception as e:
         log_error(f"Критическая ошибка при выполнении планового парсинга: {e}", exc_info=True)
         return 1
-    finally:
-        # Закрываем парсер, если он был создан
-        if 'parser_instance' in locals() and parser_instance:
-            parser_instance.close()
     
     elapsed_time = time.time() - start_time
     log_info(f"Общее время выполнения: {elapsed_time:.2f} секунд")
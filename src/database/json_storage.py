@@ -1,9 +1,53 @@
 import os
 import json
+import tempfile
+import threading
 from datetime import datetime
 from src.utils.logger import log_info, log_error
 from src.utils.config import REVIEW_STORAGE_PATH
 
+# Общая блокировка на запись: файлы отзывов и метаданных могут обновлять
+# несколько парсеров, работающих в разных потоках
+_storage_lock = threading.RLock()
+
+def get_storage_lock():
+    """
+    Возвращает текущую блокировку хранилища (потоковую или межпроцессную)
+    
+    Returns:
+        Объект блокировки с поддержкой протокола контекстного менеджера
+    """
+    return _storage_lock
+
+def use_storage_lock(lock):
+    """
+    Заменяет блокировку хранилища, например на межпроцессную
+    (multiprocessing.RLock), когда парсеры работают в разных процессах
+    
+    Args:
+        lock: Объект блокировки с поддержкой протокола контекстного менеджера
+    """
+    global _storage_lock
+    _storage_lock = lock
+
+def _write_json_atomic(path, data):
+    """
+    Записывает JSON во временный файл рядом с целевым и атомарно подменяет его.
+    Читатели без блокировки видят либо старое, либо новое содержимое, но не обрезанный файл
+    
+    Args:
+        path (str): Путь к файлу
+        data: Данные для сериализации в JSON
+    """
+    with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=os.path.dirname(path) or '.',
+                                     suffix='.tmp', delete=False) as file:
+        json.dump(data, file, ensure_ascii=False, indent=2)
+    try:
+        os.replace(file.name, path)
+    except OSError:
+        os.remove(file.name)
+        raise
+
 class ReviewsStorage:
     """
     Класс для хранения отзывов в JSON-файлах.
@@ -16,14 +60,13 @@ class ReviewsStorage:
         
         # Создаем каталог для хранения отзывов, если он не существует
         if not os.path.exists(self.storage_dir):
-            os.makedirs(self.storage_dir)
+            os.makedirs(self.storage_dir, exist_ok=True)
             log_info(f"Создан каталог для хранения отзывов: {self.storage_dir}")
             
         # Создаем файл для хранения метаданных, если он не существует
         self.metadata_file = os.path.join(self.storage_dir, "metadata.json")
         if not os.path.exists(self.metadata_file):
-            with open(self.metadata_file, 'w', encoding='utf-8') as file:
-                json.dump({}, file, ensure_ascii=False, indent=2)
+            _write_json_atomic(self.metadata_file, {})
             log_info(f"Создан файл метаданных: {self.metadata_file}")
 
     def _get_filename(self, product_id):
@@ -55,8 +98,7 @@ class ReviewsStorage:
     
     def _save_metadata(self, metadata):
         """Сохраняет метаданные продуктов"""
-        with open(self.metadata_file, 'w', encoding='utf-8') as file:
-            json.dump(metadata, file, ensure_ascii=False, indent=2)
+        _write_json_atomic(self.metadata_file, metadata)
     
     def update_product_metadata(self, product_id, last_review_date=None, last_review_ids=None, total_reviews=None):
         """
@@ -68,44 +110,45 @@ class ReviewsStorage:
             last_review_ids (list, optional): Список ID последних отзывов (до 20 штук)
             total_reviews (int, optional): Общее количество отзывов
         """
-        metadata = self._load_metadata()
-        
-        # Обновляем или создаем запись для продукта
-        if product_id not in metadata:
-            metadata[product_id] = {}
+        with _storage_lock:
+            metadata = self._load_metadata()
             
-        product_data = metadata[product_id]
-        
-        # Обновляем данные, если они предоставлены
-        if last_review_date:
-            product_data['last_review_date'] = last_review_date
-        
-        # Сохраняем до 20 последних ID отзывов
-        if last_review_ids:
-            if not isinstance(last_review_ids, list):
-                last_review_ids = [last_review_ids]
+            # Обновляем или создаем запись для продукта
+            if product_id not in metadata:
+                metadata[product_id] = {}
                 
-            if 'last_review_ids' not in product_data:
-                product_data['last_review_ids'] = []
-                
-            # Объединяем новые ID с существующими, избегая дубликатов
-            existing_ids = set(product_data['last_review_ids'])
-            for review_id in last_review_ids:
-                if review_id and review_id not in existing_ids:
-                    existing_ids.add(review_id)
-                    
-            # Оставляем только 20 последних ID
-            product_data['last_review_ids'] = list(existing_ids)[-20:]
+            product_data = metadata[product_id]
             
-        if total_reviews is not None:
-            product_data['total_reviews'] = total_reviews
+            # Обновляем данные, если они предоставлены
+            if last_review_date:
+                product_data['last_review_date'] = last_review_date
             
-        # Обновляем дату последнего парсинга
-        product_data['last_parsed'] = datetime.now().isoformat()
-        
-        # Сохраняем обновленные метаданные
-        self._save_metadata(metadata)
-        log_info(f"Обновлены метаданные для продукта {product_id}")
+            # Сохраняем до 20 последних ID отзывов
+            if last_review_ids:
+                if not isinstance(last_review_ids, list):
+                    last_review_ids = [last_review_ids]
+                    
+                if 'last_review_ids' not in product_data:
+                    product_data['last_review_ids'] = []
+                    
+                # Объединяем новые ID с существующими, избегая дубликатов
+                existing_ids = set(product_data['last_review_ids'])
+                for review_id in last_review_ids:
+                    if review_id and review_id not in existing_ids:
+                        existing_ids.add(review_id)
+                        
+                # Оставляем только 20 последних ID
+                product_data['last_review_ids'] = list(existing_ids)[-20:]
+                
+            if total_reviews is not None:
+                product_data['total_reviews'] = total_reviews
+                
+            # Обновляем дату последнего парсинга
+            product_data['last_parsed'] = datetime.now().isoformat()
+            
+            # Сохраняем обновленные метаданные
+            self._save_metadata(metadata)
+            log_info(f"Обновлены метаданные для продукта {product_id}")
 
     def get_last_review_date(self, product_id):
         """Получает дату последнего собранного отзыва для продукта"""
@@ -141,34 +184,33 @@ class ReviewsStorage:
         
         product_id = review['product_id']
         
-        # Загружаем существующие отзывы
-        reviews = self._load_reviews(product_id)
-        
-        # Проверяем, есть ли уже отзыв с таким ID
-        review_exists = any(r.get('review_id') == review.get('review_id') for r in reviews)
-        
-        if not review_exists:
-            # Добавляем временную метку сохранения
-            review['saved_at'] = datetime.now().isoformat()
-            reviews.append(review)
+        with _storage_lock:
+            # Загружаем существующие отзывы
+            reviews = self._load_reviews(product_id)
             
-            # Сохраняем обновленный список отзывов
-            filename = self._get_filename(product_id)
-            with open(filename, 'w', encoding='utf-8') as file:
-                json.dump(reviews, file, ensure_ascii=False, indent=2)
-                
-            # Обновляем метаданные для инкрементного парсинга
-            if 'date' in review and 'review_id' in review:
-                self.update_product_metadata(
-                    product_id, 
-                    last_review_date=review['date'],
-                    last_review_ids=review['review_id'],
-                    total_reviews=len(reviews)
-                )
+            # Проверяем, есть ли уже отзыв с таким ID
+            review_exists = any(r.get('review_id') == review.get('review_id') for r in reviews)
+            
+            if not review_exists:
+                # Добавляем временную метку сохранения
+                review['saved_at'] = datetime.now().isoformat()
+                reviews.append(review)
                 
-            return True
-        
-        return False  # Отзыв уже существует
+                # Сохраняем обновленный список отзывов
+                _write_json_atomic(self._get_filename(product_id), reviews)
+                    
+                # Обновляем метаданные для инкрементного парсинга
+                if 'date' in review and 'review_id' in review:
+                    self.update_product_metadata(
+                        product_id, 
+                        last_review_date=review['date'],
+                        last_review_ids=review['review_id'],
+                        total_reviews=len(reviews)
+                    )
+                    
+                return True
+            
+            return False  # Отзыв уже существует
     
     def save_reviews(self, reviews):
         """Сохраняет несколько отзывов"""
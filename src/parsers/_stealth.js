@@ -0,0 +1,87 @@
+// Обход обнаружения автоматизации: подключается ко всему контексту браузера
+(() => {
+    "use strict";
+    
+    // Удаляем свойство целиком: строгие детекторы проверяют само его наличие
+    delete Navigator.prototype.webdriver;
+
+    // Следы драйверов автоматизации в window и document
+    for (const key of ['_selenium', 'callSelenium', '_Selenium_IDE_Recorder', '__webdriver_script_fn']) {
+        delete window[key];
+    }
+    for (const key of Object.keys(document)) {
+        if (key.startsWith('$cdc_') || key.startsWith('$wdc_')) {
+            delete document[key];
+        }
+    }
+
+    // В обычном Chrome объект chrome.runtime присутствует всегда
+    if (!window.chrome) {
+        window.chrome = {};
+    }
+    if (!window.chrome.runtime) {
+        window.chrome.runtime = {};
+    }
+
+    // Свойства переопределяются на прототипе и только при необходимости:
+    // собственное свойство у navigator само по себе выдает подмену
+    // (детекторы проверяют navigator.hasOwnProperty)
+
+    // Убираем признак headless-режима из user agent
+    if (navigator.userAgent.includes('HeadlessChrome')) {
+        const userAgent = navigator.userAgent.replace('HeadlessChrome', 'Chrome');
+        Object.defineProperty(Navigator.prototype, 'userAgent', {
+            get: () => userAgent
+        });
+        const appVersion = navigator.appVersion.replace('HeadlessChrome', 'Chrome');
+        Object.defineProperty(Navigator.prototype, 'appVersion', {
+            get: () => appVersion
+        });
+    }
+
+    // В headless-режиме rtt равен нулю, чего не бывает у реальных соединений
+    if (navigator.connection && navigator.connection.rtt === 0) {
+        Object.defineProperty(Object.getPrototypeOf(navigator.connection), 'rtt', {
+            get: () => 100
+        });
+    }
+
+    // Список плагинов подменяется только если он пуст, как в headless-режиме;
+    // настоящий PluginArray обычного Chrome лучше любой подделки
+    if (navigator.plugins.length === 0) {
+        Object.defineProperty(Navigator.prototype, 'plugins', {
+            get: () => [
+                {
+                    0: {type: "application/x-google-chrome-pdf", suffixes: "pdf", description: "Portable Document Format"},
+                    description: "Portable Document Format",
+                    filename: "internal-pdf-viewer",
+                    name: "Chrome PDF Plugin",
+                    length: 1
+                },
+                {
+                    0: {type: "application/pdf", suffixes: "pdf", description: "Portable Document Format"},
+                    description: "Portable Document Format",
+                    filename: "mhjfbmdgcfjbbpaeojofohoefgiehjai",
+                    name: "Chrome PDF Viewer",
+                    length: 1
+                },
+                {
+                    0: {type: "application/x-nacl", suffixes: "", description: "Native Client Executable"},
+                    1: {type: "application/x-pnacl", suffixes: "", description: "Portable Native Client Executable"},
+                    description: "Native Client",
+                    filename: "internal-nacl-plugin",
+                    name: "Native Client",
+                    length: 2
+                }
+            ]
+        });
+    }
+
+    // Скрываем что страница автоматизирована
+    const originalQuery = window.navigator.permissions.query;
+    window.navigator.permissions.query = (parameters) => (
+        parameters.name === 'notifications' ?
+            Promise.resolve({state: Notification.permission}) :
+            originalQuery(parameters)
+    );
+})();
@@ -1,25 +1,578 @@
+import os
 import re
+import gzip
+import json
 import time
+import queue
 import random
+import tempfile
+import threading
 import uuid
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
 from playwright.sync_api import sync_playwright
 from src.utils.config import (
-    HEADLESS, USER_AGENT, REQUEST_TIMEOUT, DEFAULT_DELAY,
+    HEADLESS, USER_AGENT, NAV_TIMEOUT, ACTION_TIMEOUT, DEFAULT_DELAY,
     MAX_REVIEWS_PER_PRODUCT, MAX_RETRIES, get_random_delay,
-    INCREMENTAL_PARSING
+    get_delay_schedule, INCREMENTAL_PARSING, MAX_CONCURRENT_PRODUCTS, LEARNED_SELECTORS_PATH
 )
-from src.utils.logger import log_info, log_error, log_warning, log_debug
-from src.database.json_storage import ReviewsStorage
+from src.utils.logger import log_info, log_error, log_warning, log_debug, init_worker_logging
+from src.database.json_storage import ReviewsStorage, use_storage_lock, get_storage_lock
+
+# Размер заранее рассчитанного расписания пауз между страницами отзывов
+PAGE_DELAY_SCHEDULE_SIZE = 50
+
+# Имитация действий человека при переходах по страницам отзывов: на каждой N-й странице
+# и случайно с заданной вероятностью на остальных
+HUMAN_IMITATION_EVERY = 3
+HUMAN_IMITATION_PROBABILITY = 0.3
+
+# Единое регулярное выражение для форматов дат отзывов:
+# DD.MM.YYYY, "30 марта 2025", DD/MM/YYYY и ISO (YYYY-MM-DD, время после даты не учитывается)
+REVIEW_DATE_RE = re.compile(
+    r'(?P<dot_day>\d{1,2})\.(?P<dot_month>\d{1,2})\.(?P<dot_year>\d{4})'
+    r'|(?P<ru_day>\d{1,2})\s+(?P<ru_month>[а-яА-Я]+)\s+(?P<ru_year>\d{4})'
+    r'|(?P<slash_day>\d{1,2})/(?P<slash_month>\d{1,2})/(?P<slash_year>\d{4})'
+    r'|(?P<iso_year>\d{4})-(?P<iso_month>\d{2})-(?P<iso_day>\d{2})'
+)
+
+# Названия месяцев в родительном падеже для дат вида "30 марта 2025"
+MONTHS_RU = {
+    'января': 1, 'февраля': 2, 'марта': 3, 'апреля': 4, 'мая': 5, 'июня': 6,
+    'июля': 7, 'августа': 8, 'сентября': 9, 'октября': 10, 'ноября': 11, 'декабря': 12
+}
+
+# Регулярные выражения для извлечения ID товара из URL
+PRODUCT_URL_ID_RE = re.compile(r'/product/[^/]+-(\d+)/?')  # https://www.ozon.ru/product/item-name-123456/
+CONTEXT_URL_ID_RE = re.compile(r'/context/detail/id/(\d+)/?')  # /context/detail/id/123456/
+ID_PARAM_RE = re.compile(r'id=(\d+)')  # Альтернативный формат URL с параметром id=
+
+# Селектор блока отзывов: его появление означает, что страница готова к разбору
+REVIEWS_READY_SELECTOR = '[data-widget="webReviewList"], [data-widget="reviews"], [data-widget="webReviews"], div[class^="r9u_"], div[class*=" r9u_"], h2:has-text("Отзыв")'
+
+# Виджет со списком отзывов: если он есть после прямого перехода, дополнительные поиски не нужны
+REVIEW_WIDGET_SELECTOR = '[data-widget="webReviewList"], [data-widget="reviews"]'
+
+# Виджеты обычной страницы товара: если они есть, страница "Доступ ограничен" не показана
+PAGE_CONTENT_SELECTOR = '[data-widget="webReviewList"], [data-widget="productHeader"]'
+
+# Распространенные размеры окна: каждый контекст получает один из них.
+# Парсер читает только DOM, поэтому большой экран и масштаб лишь увеличивают отрисовку
+VIEWPORT_PRESETS = (
+    {"width": 1280, "height": 800},
+    {"width": 1366, "height": 768},
+    {"width": 1440, "height": 900},
+)
+
+# Типы ресурсов, которые не нужны для разбора текста отзывов и блокируются при загрузке
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media", "stylesheet"})
+
+# Аналитика, реклама и трекеры: блокируются всегда, они только задерживают загрузку страницы
+BLOCKED_URL_RE = re.compile(
+    r"mc\.yandex\.|yandex\.ru/metrika|googletagmanager|google-analytics|doubleclick|"
+    r"top-fwz1\.mail\.ru|vk\.com/rtrg|/analytics|/metrics"
+)
+
+# Проверка сообщения об отсутствии отзывов одной проверкой текста страницы вместо нескольких
+# селекторов с :has-text. Фраза должна занимать строку целиком, чтобы "нет отзывов" внутри
+# текста отзыва, вопроса или карточки рекомендаций не принималось за сообщение
+NO_REVIEWS_JS = (r"() => /^\s*(У этого товара пока нет отзывов|Отзывов пока нет|Нет отзывов|Еще нет отзывов)\s*$/m"
+                 r".test(document.body.innerText)")
+
+# Условие для _settle: на странице не осталось заглушек загружаемого контента
+NO_SKELETON_JS = "() => !document.querySelector('[data-widget=\"skeleton\"]')"
+
+# Имитация прокрутки человеком целиком внутри страницы: случайные шаги, иногда
+# небольшой возврат назад, ожидание исчезновения заглушек между шагами и
+# в конце прокрутка к секции отзывов
+_HUMAN_SCROLL_JS = """
+async ({maxScrolls}) => {
+    const randInt = (min, max) => Math.floor(Math.random() * (max - min + 1)) + min;
+    const sleep = (ms) => new Promise(resolve => setTimeout(resolve, ms));
+    const settle = async (timeout = 1500) => {
+        const deadline = Date.now() + timeout;
+        while (document.querySelector('[data-widget="skeleton"]') && Date.now() < deadline) {
+            await sleep(100);
+        }
+        await sleep(randInt(50, 150));
+    };
+    
+    const viewportHeight = window.innerHeight;
+    const pageHeight = document.body.scrollHeight;
+    const scrolls = Math.min(maxScrolls, Math.max(1, Math.floor(pageHeight / viewportHeight)));
+    
+    for (let i = 0; i < scrolls; i++) {
+        const amount = randInt(Math.floor(viewportHeight / 2), viewportHeight + randInt(10, 100));
+        window.scrollBy({top: amount, left: 0, behavior: 'smooth'});
+        await settle();
+        
+        // Иногда немного прокручиваем назад, как это делают люди
+        if (Math.random() < 0.3) {
+            window.scrollBy({top: -randInt(50, 200), left: 0, behavior: 'smooth'});
+            await settle();
+        }
+    }
+    
+    // В конце прокручиваем к заголовку секции отзывов или к самому блоку
+    const reviewsHeader = Array.from(document.querySelectorAll('h2')).find(h =>
+        h.textContent.includes('Отзыв') || h.textContent.includes('отзыв'));
+    const target = reviewsHeader ||
+        document.querySelector('[data-widget="webReviewList"]') ||
+        document.querySelector('[data-widget="reviews"]');
+    if (target) {
+        target.scrollIntoView({behavior: 'smooth', block: 'center'});
+        return true;
+    }
+    return false;
+}
+"""
+
+# Скрипт обхода обнаружения автоматизации: читается с диска один раз при импорте
+_STEALTH_INIT_JS = (Path(__file__).parent / '_stealth.js').read_text(encoding='utf-8')
+
+# Извлечение всех полей отзыва за один вызов evaluate: селекторы выполняются внутри страницы,
+# в Python возвращается готовый словарь
+_EXTRACT_REVIEW_JS = """
+(el) => {
+    // Первый найденный по списку селекторов элемент
+    const first = (...selectors) => {
+        for (const selector of selectors) {
+            const node = el.querySelector(selector);
+            if (node) {
+                return node;
+            }
+        }
+        return null;
+    };
+    const textOf = (node) => node ? node.innerText.trim() : "";
+    const inRange = (count) => count > 0 && count <= 5;
+    
+    // Количество закрашенных звезд: сначала точный критерий, затем запасные способы
+    const countStars = (container) => {
+        // Способ 1: SVG с оранжевым цветом (rgb(255, 165, 0)) - один объединенный селектор
+        let count = container.querySelectorAll(
+            'svg[style*="rgb(255, 165, 0)"], svg[style*="rgb(255,165,0)"], svg[style*="orange"]'
+        ).length;
+        if (inRange(count)) {
+            return count;
+        }
+        
+        // Способ 2: CSS селекторы для разных форматов цвета
+        const selectors = [
+            'svg[style*="color: rgb(255"]',
+            'svg[style*="orange"]',
+            'svg[style*="rgb(255, 165"]',
+            'svg[style*="#f"]',
+            'svg[fill*="#f"]',
+            'svg[fill="currentColor"]'
+        ];
+        for (const selector of selectors) {
+            count = container.querySelectorAll(selector).length;
+            if (inRange(count)) {
+                return count;
+            }
+        }
+        
+        // Способ 3: более широкие критерии цвета (любой оттенок оранжевого)
+        const svgs = Array.from(container.querySelectorAll('svg'));
+        count = svgs.filter(svg => {
+            const color = window.getComputedStyle(svg).color || '';
+            const style = svg.getAttribute('style') || '';
+            const fill = svg.getAttribute('fill') || '';
+            return color.includes('255') ||
+                   style.includes('rgb(255') || style.includes('orange') ||
+                   style.includes('gold') || style.includes('#f') ||
+                   fill.includes('#f') || fill.includes('orange') || fill.includes('gold');
+        }).length;
+        if (inRange(count)) {
+            return count;
+        }
+        
+        // Способ 4: SVG без rgba в стиле (обычно это закрашенные звезды)
+        count = svgs.filter(svg => !(svg.getAttribute('style') || '').includes('rgba')).length;
+        return inRange(count) ? count : 0;
+    };
+    
+    // Сначала точные классы (быстрое сравнение по списку классов), затем запасные подстроки
+    const ratingContainer = first('div.p6x_31 > div.a5d25-a', 'div[class*="p6x_"] > div[class*="a5d25-a"]', 'div[class*="p6x_"], div[class*="a5d25-a"]');
+    
+    return {
+        uuid: el.getAttribute('data-review-uuid'),
+        text: textOf(first('div.px7_31.y4p_31 > div.x7p_31 > div > span.p7x_31', 'div[class*="px7_"][class*="y4p_"] > div[class*="x7p_"] > div > span[class*="p7x_"]')),
+        author: textOf(first('span.p8u_31', 'span[class*="p8u_"]')),
+        date: textOf(first('div.x5p_31', 'div[class*="x5p_"]', 'div[class*="rv1_"]')),
+        variant: textOf(first('a.y3p_31', 'a[class*="y3p_"]')),
+        rating: ratingContainer ? countStars(ratingContainer) : 0
+    };
+}
+"""
+
+# Установка функции извлечения в страницу: V8 компилирует ее один раз на страницу
+_EXTRACT_REVIEW_INIT_JS = f"window.__extractReview = {_EXTRACT_REVIEW_JS.strip()};"
+# Извлечение всех отзывов, найденных селектором, одним вызовом evaluate
+_EXTRACT_ALL_CALL = "sel => Array.from(document.querySelectorAll(sel), el => window.__extractReview(el))"
+_COUNT_CALL = "sel => document.querySelectorAll(sel).length"
+
+# Первый селектор из списка (в порядке приоритета), у которого есть совпадения: [индекс, количество] или [-1, 0]
+_FIRST_MATCHING_JS = """
+(selectors) => {
+    for (let i = 0; i < selectors.length; i++) {
+        const count = document.querySelectorAll(selectors[i]).length;
+        if (count > 0) {
+            return [i, count];
+        }
+    }
+    return [-1, 0];
+}
+"""
+
+# Поиск ссылки или заголовка с текстом "отзыв" через XPath с прокруткой к нему
+_FIND_REVIEWS_TEXT_JS = """
+() => {
+    const result = document.evaluate(
+        '//a[contains(@href, "reviews")]' +
+        ' | //*[self::a or self::button or self::h2]' +
+        '[contains(translate(., "ОТЗЫВREVIEW", "отзывreview"), "отзыв")' +
+        ' or contains(translate(., "ОТЗЫВREVIEW", "отзывreview"), "review")]',
+        document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null);
+    const element = result.singleNodeValue;
+    if (!element) {
+        return false;
+    }
+    element.scrollIntoView({behavior: 'smooth', block: 'center'});
+    return true;
+}
+"""
+
+# Поиск кнопки "Дальше" среди ссылок и кнопок, возвращает ее XPath и текст
+_FIND_NEXT_BUTTON_JS = """
+() => {
+    // XPath элемента по позициям среди дочерних элементов: один indexOf на уровень
+    // вместо обхода всех предыдущих соседей через previousSibling
+    const xpathOf = (el) => {
+        let path = '';
+        for (let temp = el; temp; temp = temp.parentElement) {
+            const parent = temp.parentElement;
+            path = parent
+                ? `/*[${Array.prototype.indexOf.call(parent.children, temp) + 1}]${path}`
+                : `/${temp.tagName.toLowerCase()}${path}`;
+        }
+        return path;
+    };
+    
+    // Ищем элементы с текстом "Дальше" или "Следующая"
+    const elements = Array.from(document.querySelectorAll('a, button'))
+        .filter(el => {
+            const text = el.innerText?.trim().toLowerCase() || '';
+            return text === 'дальше' || text === 'следующая' || text === 'вперед' || 
+                   text === '→' || text === 'next' || text === '>' || text.includes('след');
+        });
+    
+    if (elements.length > 0) {
+        const element = elements[0];
+        // Возвращаем XPath для элемента
+        return {
+            xpath: xpathOf(element),
+            text: element.innerText?.trim(),
+            isClickable: element.tagName === 'A' || element.tagName === 'BUTTON'
+        };
+    }
+    
+    // Ищем элементы с арабской цифрой, большей 1 (потенциальные страницы)
+    const pageNumbers = Array.from(document.querySelectorAll('a, span, div'))
+        .filter(el => {
+            const text = el.innerText?.trim() || '';
+            return /^[2-9][0-9]*$/.test(text); // Число больше 1
+        })
+        .sort((a, b) => parseInt(a.innerText) - parseInt(b.innerText));
+    
+    if (pageNumbers.length > 0) {
+        // Берем элемент с наименьшим номером, большим 1
+        const nextPageElement = pageNumbers[0];
+        return {
+            xpath: xpathOf(nextPageElement),
+            text: nextPageElement.innerText?.trim(),
+            isClickable: nextPageElement.tagName === 'A' || nextPageElement.tagName === 'BUTTON'
+        };
+    }
+    
+    return null;
+}
+"""
+
+# Поиск контейнера с наибольшим числом элементов с классами отзывов,
+# возвращает селектор его дочерних элементов (предполагаемых отзывов) или null
+_POTENTIAL_REVIEWS_SELECTOR_JS = """
+() => {
+    // Функция для поиска потенциальных контейнеров отзывов
+    function findPotentialReviews() {
+        // Ищем элементы с классами, содержащими определенные паттерны
+        const classPatterns = ['review', 'otziv', 'rv', 'r0o', 'y4p', 'vp5'];
+        
+        // Находим все элементы с подходящими классами
+        const elements = [];
+        for (const pattern of classPatterns) {
+            const matches = document.querySelectorAll(`[class*="${pattern}"]`);
+            for (const match of matches) {
+                elements.push(match);
+            }
+        }
+        
+        // Ищем контейнеры, которые могут содержать несколько похожих элементов
+        const containers = new Map();
+        for (const el of elements) {
+            // Проверяем 3 уровня родителей
+            let parent = el.parentElement;
+            for (let i = 0; i < 3 && parent; i++) {
+                if (!containers.has(parent)) {
+                    containers.set(parent, 0);
+                }
+                containers.set(parent, containers.get(parent) + 1);
+                parent = parent.parentElement;
+            }
+        }
+        
+        // Находим контейнеры с наибольшим количеством подходящих элементов
+        const potentialContainers = Array.from(containers.entries())
+            .filter(([_, count]) => count > 2)  // Минимум 3 подходящих элемента
+            .sort(([_, countA], [__, countB]) => countB - countA);
+        
+        if (potentialContainers.length === 0) {
+            return null;
+        }
+        
+        // Селектор по первому классу контейнера: без класса он был бы слишком общим
+        const container = potentialContainers[0][0];
+        if (container.classList.length === 0) {
+            return null;
+        }
+        return `${container.tagName.toLowerCase()}.${CSS.escape(container.classList[0])} > *`;
+    }
+    
+    return findPotentialReviews();
+}
+"""
+
+# Состояние пагинации за один вызов: последняя ли страница и ссылка rel="next", если она есть
+_PAGINATION_STATE_JS = """
+() => {
+    const next = document.querySelector('link[rel="next"][href], a[rel="next"][href]');
+    const disabled = document.querySelector(
+        '[data-widget^="webReview"] [disabled][class*="next"], [data-widget^="webReview"] [aria-disabled="true"][class*="next"]'
+    );
+    return {
+        done: !next && (disabled !== null || document.body.textContent.includes('отзывов больше нет')),
+        nextHref: next ? next.href : null
+    };
+}
+"""
+
+def _write_gzip_atomic(path, text):
+    """Записывает текст в gzip-файл через временный файл, чтобы на диске не оставалось недописанных файлов"""
+    tmp_path = f"{path}.tmp"
+    # Минимальный уровень сжатия: HTML сжимается в разы при почти нулевой нагрузке на CPU
+    with gzip.open(tmp_path, "wt", encoding="utf-8", compresslevel=1) as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+def _load_learned_selectors():
+    """Загружает селекторы отзывов, подобранные на прошлых запусках: хост -> селектор"""
+    try:
+        with open(LEARNED_SELECTORS_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        log_warning(f"Не удалось загрузить сохраненные селекторы отзывов: {e}")
+        return {}
+
+def _save_learned_selectors(updates):
+    """
+    Добавляет подобранные селекторы к сохраненным на диске и записывает файл через
+    уникальный временный файл. Файл перечитывается под блокировкой хранилища, чтобы
+    не потерять селекторы, сохраненные другими потоками и процессами
+    
+    Args:
+        updates (dict): Селекторы, подобранные этим парсером: хост -> селектор
+            (None - удалить селектор хоста)
+    """
+    try:
+        directory = os.path.dirname(LEARNED_SELECTORS_PATH) or "."
+        os.makedirs(directory, exist_ok=True)
+        with get_storage_lock():
+            selectors = _load_learned_selectors()
+            for host, selector in updates.items():
+                if selector is None:
+                    selectors.pop(host, None)
+                else:
+                    selectors[host] = selector
+            with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=directory,
+                                             suffix=".tmp", delete=False) as f:
+                json.dump(selectors, f, ensure_ascii=False, indent=2)
+            os.replace(f.name, LEARNED_SELECTORS_PATH)
+    except Exception as e:
+        log_warning(f"Не удалось сохранить селекторы отзывов: {e}")
+
+def _looks_like_reviews(reviews):
+    """Проверяет, что большинство извлеченных записей похожи на отзывы: есть дата и оценка или текст"""
+    valid = sum(1 for r in reviews if r["date"] and (r["rating"] or r["text"]))
+    return valid > 0 and valid * 2 >= len(reviews)
+
+def _reviews_url(product_url):
+    """Возвращает URL страницы отзывов товара: путь с /reviews/ на конце, без параметров и якоря"""
+    parts = urlsplit(product_url)
+    return urlunsplit((parts.scheme, parts.netloc, parts.path.rstrip('/') + '/reviews/', '', ''))
+
+def _page_param(url):
+    """Возвращает номер страницы из параметра page в URL или None"""
+    value = dict(parse_qsl(urlsplit(url).query)).get("page", "")
+    return int(value) if value.isdigit() else None
+
+def _with_page_param(url, page_num):
+    """Возвращает URL с параметром page=page_num (остальные параметры и якорь сохраняются)"""
+    parts = urlsplit(url)
+    query = dict(parse_qsl(parts.query, keep_blank_values=True))
+    query["page"] = str(page_num)
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+def _ts():
+    """Метка времени для имен отладочных файлов (наносекунды не совпадают даже в пределах секунды)"""
+    return time.time_ns()
+
+@lru_cache(maxsize=4096)
+def _match_product_id(url):
+    """Возвращает ID товара из URL или None (результат кэшируется для повторяющихся URL)"""
+    # Основной формат /product/<название>-<id>/ разбираем строковыми операциями, без регулярных выражений
+    if '/product/' in url:
+        tail = url.split('/product/', 1)[1].split('/', 1)[0].split('?', 1)[0].split('#', 1)[0]
+        if '-' in tail:
+            candidate = tail.rsplit('-', 1)[1]
+            if candidate.isdigit():
+                return candidate
+    
+    for pattern in (PRODUCT_URL_ID_RE, CONTEXT_URL_ID_RE, ID_PARAM_RE):
+        match = pattern.search(url)
+        if match:
+            return match.group(1)
+    return None
+
+@lru_cache(maxsize=1024)
+def _match_review_date(date_str):
+    """Возвращает дату отзыва из строки или None, если формат не распознан (результат кэшируется по строке даты)"""
+    # Один проход регулярного выражения вместо последовательных проверок
+    match = REVIEW_DATE_RE.match(date_str)
+    
+    # Если формат DD.MM.YYYY
+    if match and match.group('dot_day'):
+        return datetime(int(match.group('dot_year')), int(match.group('dot_month')),
+                        int(match.group('dot_day')))
+    
+    # Если формат DD/MM/YYYY
+    if match and match.group('slash_day'):
+        return datetime(int(match.group('slash_year')), int(match.group('slash_month')),
+                        int(match.group('slash_day')))
+    
+    # Если формат "30 марта 2025" или похожий
+    if match and match.group('ru_day'):
+        month_name = match.group('ru_month').lower()
+        
+        if month_name in MONTHS_RU:
+            month = MONTHS_RU[month_name]
+            return datetime(int(match.group('ru_year')), month, int(match.group('ru_day')))
+    
+    # Если дата в формате ISO (YYYY-MM-DD)
+    if match and match.group('iso_day'):
+        return datetime(int(match.group('iso_year')), int(match.group('iso_month')),
+                        int(match.group('iso_day')))
+    
+    return None
 
 class OzonReviewParser:
-    def __init__(self, debug_mode=False):
-        """Инициализация парсера отзывов Озона"""
+    # Селекторы вкладки "Отзывы", объединенные в один запрос к браузеру
+    _REVIEW_TAB_SELECTOR = ", ".join(f"{selector}:visible" for selector in (
+        'a:has-text("Отзывы")',
+        'a:has-text("отзывы")',
+        'a:has-text("ОТЗЫВЫ")',
+        'a:has-text("Reviews")',
+        'a:has-text("reviews")',
+        'div:has-text("Отзывы") a',
+        'a:has-text("Все отзывы")',
+        'a[href*="/reviews"]',
+        'a[href*="tab=reviews"]'
+    ))
+    
+    # Элементы, по которым видно, что секция отзывов на странице
+    _REVIEW_INDICATOR_SELECTOR = ", ".join(f"{selector}:visible" for selector in (
+        'div[data-review-uuid]',
+        'div[data-widget="webReviewList"]',
+        'div[itemprop="review"]',
+        'div.review-item',
+        'div:has-text("Отзывы покупателей")',
+        'h2:has-text("Отзывы")',
+        'div:has-text("У этого товара пока нет отзывов")'
+    ))
+    
+    # Возможные селекторы кнопки "Дальше", объединенные в один запрос к браузеру
+    _NEXT_BUTTON_SELECTOR = ", ".join(f"{selector}:visible" for selector in (
+        'div.b2122-a8:has-text("Дальше")',            # Селектор из старого кода
+        'button:has-text("Дальше")',                  # Кнопка по тексту
+        'div:has-text("Дальше"):not(:has(div))',      # Текст "Дальше" в div
+        'a:has-text("Дальше")',                       # Ссылка с текстом "Дальше"
+        'div.gp7_32:has-text("Дальше")',              # Специфический класс
+        '.paginator a.xg9_32',                        # Пагинация
+        'div[data-widget="paginator"] a:last-child',  # Последняя ссылка в пагинаторе
+        '[data-widget="paginator"] [data-test-id="next-page"]', # Тестовый ID для кнопки пагинации
+        '[data-test-id="next-page"]'                  # Тестовый ID кнопки "Следующая страница"
+    ))
+    
+    # Альтернативные селекторы элементов отзывов, если нет атрибута data-review-uuid (в порядке приоритета)
+    _ALT_REVIEW_SELECTORS = (
+        'div[data-widget="webReviewList"] > div',
+        'div[itemprop="review"]',
+        'div.rv3_32 > div',  # Из скриншота
+        'div.r0o_32',        # Из скриншота
+        'div.rw5_32',        # Из скриншота
+        'div:has(span.y4p_32)',  # Контейнер с текстом отзыва
+        'div:has(div.vp5_32)',   # Контейнер с рейтингом (звезды)
+        'div:has(div.r0o_32)',   # Контейнер с данными автора
+        'div.review-item',
+        'div.rc1_32'          # Еще один класс из структуры
+    )
+    
+    def __init__(self, debug_mode=False, block_assets=None):
+        """
+        Инициализация парсера отзывов Озона
+        
+        Args:
+            debug_mode (bool): Режим отладки с сохранением скриншотов
+            block_assets (bool, optional): Блокировать загрузку изображений, шрифтов, медиа и стилей.
+                По умолчанию включено вне режима отладки (скриншотам нужны изображения)
+        """
         self.db = ReviewsStorage()
         self.playwright = None
         self.browser = None
         self.context = None
         self.debug_mode = debug_mode
+        self.block_assets = not debug_mode if block_assets is None else block_assets
+        
+        # Данные текущего товара: запоминаются один раз и используются при переходах по страницам
+        self._reviews_base_url = None
+        self._reviews_page_num = 1
+        
+        # Счетчик переходов между страницами для прореживания имитации действий человека
+        self._pagination_step = 0
+        
+        # Альтернативные селекторы элементов отзывов, сработавшие для сайтов: хост -> селектор.
+        # Загружаются с прошлых запусков и сохраняются при закрытии парсера
+        self._learned_selectors = _load_learned_selectors()
+        self._learned_selector_updates = {}
+        
+        # Фоновая запись отладочных скриншотов и HTML (создается при первой записи)
+        self._screenshot_executor = None
         
     def _extract_product_id(self, url):
         """
@@ -31,25 +584,21 @@ class OzonReviewParser:
         Returns:
             str: ID продукта или None, если не удалось извлечь
         """
-        # Пытаемся извлечь ID товара из URL, например из https://www.ozon.ru/product/item-name-123456/
-        # Уточненное выражение для /product/
-        match = re.search(r'/product/[^/]+-(\d+)/?', url)
-        if match:
-            return match.group(1)
-            
-        # Новый паттерн для /context/detail/id/...
-        match = re.search(r'/context/detail/id/(\d+)/?', url)
-        if match:
-            return match.group(1)
-            
-        # Альтернативный формат URL с параметром id=
-        match = re.search(r'id=(\d+)', url)
-        if match:
-            return match.group(1)
+        # Пытаемся извлечь ID товара из URL по заранее скомпилированным шаблонам
+        product_id = _match_product_id(url)
+        if product_id:
+            return product_id
             
         log_warning(f"Не удалось извлечь ID продукта из URL: {url}") # Добавим логгирование для отладки
         return None
     
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+    
     def _initialize_browser(self):
         """
         Инициализация браузера и контекста с улучшенными настройками для обхода защиты
@@ -57,6 +606,19 @@ class OzonReviewParser:
         Returns:
             bool: True, если инициализация прошла успешно, иначе False
         """
+        return self._ensure_browser() and self._new_context()
+    
+    def _ensure_browser(self):
+        """
+        Запускает Playwright и браузер, если они еще не запущены.
+        Браузер переиспользуется для всех товаров, для каждого товара создается отдельный контекст.
+        
+        Returns:
+            bool: True, если браузер готов к работе, иначе False
+        """
+        if self.browser:
+            return True
+            
         try:
             self.playwright = sync_playwright().start()
             
@@ -73,11 +635,28 @@ class OzonReviewParser:
                 ]
             )
             
+            log_info("Браузер успешно запущен")
+            return True
+        except Exception as e:
+            log_error(f"Ошибка при запуске браузера: {e}", exc_info=True)
+            return False
+    
+    def _new_context(self):
+        """
+        Создает новый контекст браузера для обработки очередного товара
+        
+        Returns:
+            bool: True, если контекст создан успешно, иначе False
+        """
+        try:
+            # Закрываем предыдущий контекст, если он остался открытым
+            self._close_context()
+            
             # Настраиваем контекст браузера с более реалистичными параметрами
             self.context = self.browser.new_context(
                 user_agent=USER_AGENT,
-                viewport={"width": 1920, "height": 1080},
-                device_scale_factor=1.5,
+                viewport=random.choice(VIEWPORT_PRESETS),
+                device_scale_factor=1,
                 locale="ru-RU",
                 timezone_id="Europe/Moscow",
                 color_scheme="light",
@@ -102,69 +681,43 @@ class OzonReviewParser:
                 }
             )
             
-            # Устанавливаем тайм-аут для всех операций
-            self.context.set_default_timeout(REQUEST_TIMEOUT)
+            # Короткие тайм-ауты: зависшее ожидание быстрее уходит на повторную попытку
+            self.context.set_default_navigation_timeout(NAV_TIMEOUT)
+            self.context.set_default_timeout(ACTION_TIMEOUT)
+            
+            # Отключаем ресурсы, которые не нужны для разбора отзывов. Без режима отладки,
+            # так как скриншотам нужны изображения; иначе запросы не передаются в Python вовсе
+            if self.block_assets:
+                self.context.route("**/*", self._route_block_assets)
+            
+            # Трекеры блокируются всегда: в Python приходят только запросы, совпавшие с шаблоном.
+            # Обработчик, добавленный позже, срабатывает первым
+            self.context.route(BLOCKED_URL_RE, lambda route: route.abort())
             
             # Переопределяем webdriver свойства для обхода обнаружения
             self._bypass_detection()
             
-            log_info("Браузер и контекст успешно инициализированы")
+            # Функция извлечения отзывов загружается в каждую страницу один раз
+            self.context.add_init_script(_EXTRACT_REVIEW_INIT_JS)
+            
+            log_info("Контекст браузера успешно создан")
             return True
         except Exception as e:
-            log_error(f"Ошибка при инициализации браузера: {e}", exc_info=True)
+            log_error(f"Ошибка при создании контекста браузера: {e}", exc_info=True)
             return False
     
+    def _route_block_assets(self, route):
+        """Обработчик запросов контекста: прерывает загрузку изображений, шрифтов, медиа и стилей"""
+        if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+            route.abort()
+        else:
+            route.continue_()
+    
     def _bypass_detection(self):
         """Обход обнаружения автоматизации через изменение свойств navigator и webdriver"""
         try:
-            # Получаем страницу для внедрения скриптов
-            page = self.context.new_page()
-            
-            # Внедряем скрипт для обхода webdriver detection
-            page.add_init_script("""
-                Object.defineProperty(navigator, 'webdriver', {
-                    get: () => false
-                });
-                
-                // Перегрузка свойств, используемых для обнаружения автоматизации
-                Object.defineProperty(navigator, 'plugins', {
-                    get: () => [
-                        {
-                            0: {type: "application/x-google-chrome-pdf", suffixes: "pdf", description: "Portable Document Format"},
-                            description: "Portable Document Format",
-                            filename: "internal-pdf-viewer",
-                            name: "Chrome PDF Plugin",
-                            length: 1
-                        },
-                        {
-                            0: {type: "application/pdf", suffixes: "pdf", description: "Portable Document Format"},
-                            description: "Portable Document Format",
-                            filename: "mhjfbmdgcfjbbpaeojofohoefgiehjai",
-                            name: "Chrome PDF Viewer",
-                            length: 1
-                        },
-                        {
-                            0: {type: "application/x-nacl", suffixes: "", description: "Native Client Executable"},
-                            1: {type: "application/x-pnacl", suffixes: "", description: "Portable Native Client Executable"},
-                            description: "Native Client",
-                            filename: "internal-nacl-plugin",
-                            name: "Native Client",
-                            length: 2
-                        }
-                    ]
-                });
-                
-                // Скрываем что страница автоматизирована
-                const originalQuery = window.navigator.permissions.query;
-                window.navigator.permissions.query = (parameters) => (
-                    parameters.name === 'notifications' ?
-                        Promise.resolve({state: Notification.permission}) :
-                        originalQuery(parameters)
-                );
-            """)
-            
-            # Закрываем временную страницу
-            page.close()
+            # Скрипт на уровне контекста применяется ко всем его страницам
+            self.context.add_init_script(_STEALTH_INIT_JS)
             log_info("Антидетект скрипты успешно добавлены")
         except Exception as e:
             log_error(f"Ошибка при добавлении антидетект скриптов: {e}")
@@ -183,63 +736,8 @@ class OzonReviewParser:
         try:
             log_info("Имитация прокрутки страницы человеком")
             
-            # Получаем высоту страницы
-            page_height = page.evaluate("() => document.body.scrollHeight")
-            viewport_height = page.evaluate("() => window.innerHeight")
-            
-            # Определяем количество прокруток
-            scrolls = min(max_scrolls, max(1, page_height // viewport_height))
-            
-            for i in range(scrolls):
-                # Случайная величина прокрутки
-                scroll_amount = random.randint(
-                    viewport_height // 2, 
-                    viewport_height + random.randint(10, 100)
-                )
-                
-                # Эмулируем плавную прокрутку
-                page.evaluate(f"""() => {{
-                    window.scrollBy({{
-                        top: {scroll_amount},
-                        left: 0,
-                        behavior: 'smooth'
-                    }});
-                }}""")
-                
-                # Случайная задержка между прокрутками
-                time.sleep(random.uniform(0.5, 2.0))
-                
-                # Иногда немного прокручиваем назад, как это делают люди
-                if random.random() < 0.3:
-                    page.evaluate(f"""() => {{
-                        window.scrollBy({{
-                            top: -{random.randint(50, 200)},
-                            left: 0,
-                            behavior: 'smooth'
-                        }});
-                    }}""")
-                    time.sleep(random.uniform(0.3, 0.7))
-            
-            # В конце прокручиваем до нужного места
-            page.evaluate("""() => {
-                // Пытаемся найти заголовок секции отзывов
-                const reviewsHeader = Array.from(document.querySelectorAll('h2')).find(h => 
-                    h.textContent.includes('Отзыв') || h.textContent.includes('отзыв'));
-                
-                if (reviewsHeader) {
-                    reviewsHeader.scrollIntoView({ behavior: 'smooth', block: 'center' });
-                    return true;
-                }
-                
-                // Альтернативный поиск по атрибутам
-                const reviewsSection = document.querySelector('[data-widget="webReviewList"]') || 
-                                      document.querySelector('[data-widget="reviews"]');
-                
-                if (reviewsSection) {
-                    reviewsSection.scrollIntoView({ behavior: 'smooth', block: 'center' });
-                    return true;
-                }
-            }""")
+            # Весь цикл прокрутки выполняется в браузере за один вызов
+            page.evaluate(_HUMAN_SCROLL_JS, {"maxScrolls": max_scrolls})
             
             return True
         except Exception as e:
@@ -273,19 +771,113 @@ class OzonReviewParser:
                 # Перемещаем мышь
                 page.mouse.move(x, y, steps=speed)
                 
-                # Случайная задержка
-                time.sleep(random.uniform(0.1, 0.8))
-                
                 # С вероятностью 30% делаем клик
                 if random.random() < 0.3:
                     page.mouse.click(x, y)
-                    time.sleep(random.uniform(0.3, 1.0))
+                    self._settle(page)
             
             return True
         except Exception as e:
             log_error(f"Ошибка при эмуляции движений мыши: {e}")
             return False
             
+    def _should_imitate_human(self):
+        """
+        Решает, нужна ли имитация прокрутки и движений мыши после перехода на страницу.
+        
+        Returns:
+            bool: True на каждом HUMAN_IMITATION_EVERY-м переходе или случайно с вероятностью HUMAN_IMITATION_PROBABILITY
+        """
+        self._pagination_step += 1
+        return self._pagination_step % HUMAN_IMITATION_EVERY == 0 or random.random() < HUMAN_IMITATION_PROBABILITY
+    
+    def _save_screenshot(self, page, path):
+        """
+        Делает скриншот видимой области в JPEG и записывает файл в фоновом потоке,
+        чтобы запись на диск не задерживала парсинг
+        
+        Args:
+            page: Объект страницы Playwright
+            path (str): Путь к файлу скриншота
+            
+        Returns:
+            bool: True, если скриншот сделан, иначе False
+        """
+        try:
+            data = page.screenshot(type="jpeg", quality=60, full_page=False)
+            if self._screenshot_executor is None:
+                self._screenshot_executor = ThreadPoolExecutor(max_workers=1)
+            self._screenshot_executor.submit(Path(path).write_bytes, data)
+            return True
+        except Exception as e:
+            log_debug(f"Не удалось сделать скриншот {path}: {e}")
+            return False
+    
+    def _save_html(self, page, path):
+        """
+        Сохраняет HTML страницы в gzip-файл; сжатие и запись выполняются в фоновом потоке
+        
+        Args:
+            page: Объект страницы Playwright
+            path (str): Путь к файлу (.html.gz)
+            
+        Returns:
+            bool: True, если HTML получен, иначе False
+        """
+        try:
+            html = page.content()
+            if self._screenshot_executor is None:
+                self._screenshot_executor = ThreadPoolExecutor(max_workers=1)
+            self._screenshot_executor.submit(_write_gzip_atomic, path, html)
+            return True
+        except Exception as e:
+            log_debug(f"Не удалось сохранить HTML {path}: {e}")
+            return False
+    
+    def _wait_for_reviews_ready(self, page, timeout=8000):
+        """
+        Ожидает появления блока отзывов на странице.
+        Используется вместо networkidle: Озон постоянно шлет аналитические запросы,
+        и ожидание тишины в сети часто длится до полного таймаута.
+        
+        Args:
+            page: Объект страницы Playwright
+            timeout (int): Максимальное время ожидания в миллисекундах
+            
+        Returns:
+            bool: True, если блок отзывов появился, иначе False
+        """
+        try:
+            page.wait_for_selector(REVIEWS_READY_SELECTOR, state="attached", timeout=timeout)
+            return True
+        except Exception as e:
+            log_debug(f"Блок отзывов не появился за {timeout} мс: {e}")
+            return False
+    
+    def _settle(self, page, expr=NO_SKELETON_JS, timeout=1500):
+        """
+        Ожидает выполнения условия на странице вместо фиксированной паузы.
+        Возвращает управление сразу, как только условие выполнено;
+        небольшая случайная задержка в конце сохраняет неравномерность действий.
+        
+        Args:
+            page: Объект страницы Playwright
+            expr (str): JavaScript-функция, возвращающая истину, когда страница готова
+            timeout (int): Максимальное время ожидания в миллисекундах
+            
+        Returns:
+            bool: True, если условие выполнилось, иначе False
+        """
+        try:
+            page.wait_for_function(expr, timeout=timeout)
+            settled = True
+        except Exception as e:
+            log_debug(f"Условие ожидания не выполнилось за {timeout} мс: {e}")
+            settled = False
+        
+        time.sleep(random.uniform(0.05, 0.15))
+        return settled
+    
     def _open_page(self, page, url):
         """
         Открывает URL в браузере с обработкой ошибок
@@ -299,14 +891,14 @@ class OzonReviewParser:
         """
         try:
             log_info(f"Переход на страницу: {url}")
-            page.goto(url, wait_until="domcontentloaded", timeout=REQUEST_TIMEOUT)
-            page.wait_for_load_state("networkidle", timeout=REQUEST_TIMEOUT)
+            response = page.goto(url, wait_until="domcontentloaded")
+            self._wait_for_reviews_ready(page)
             
-            # Случайная задержка после загрузки страницы
-            time.sleep(get_random_delay())
+            # Ждем, пока догрузятся заглушки контента
+            self._settle(page)
             
             # Проверяем, есть ли ограничение доступа и пытаемся его обойти
-            self._solve_access_restriction(page)
+            self._solve_access_restriction(page, response)
             
             return True
         except Exception as e:
@@ -315,39 +907,55 @@ class OzonReviewParser:
             # Делаем скриншот в режиме отладки
             if self.debug_mode:
                 try:
-                    page.screenshot(path=f"debug_page_error_{datetime.now().strftime('%Y%m%d%H%M%S')}.png")
+                    self._save_screenshot(page, f"debug_page_error_{_ts()}.jpg")
                     log_debug("Сделан скриншот страницы с ошибкой")
                 except Exception as screenshot_error:
                     log_debug(f"Не удалось сделать скриншот: {screenshot_error}")
             
             return False
             
-    def _solve_access_restriction(self, page):
+    def _is_access_restricted(self, page, response=None):
+        """
+        Проверяет, показал ли Озон страницу "Доступ ограничен".
+        Сначала смотрит на статус ответа и виджеты товара, и только если их нет,
+        ищет текст ограничения по всей странице
+        
+        Args:
+            page: Объект страницы Playwright
+            response: Ответ page.goto, если известен
+            
+        Returns:
+            bool: True, если доступ ограничен
+        """
+        if (response is None or response.ok) and page.locator(PAGE_CONTENT_SELECTOR).count() > 0:
+            return False
+        return page.get_by_text("Доступ ограничен").is_visible()
+    
+    def _solve_access_restriction(self, page, response=None):
         """
         Пытается решить проблему с ограничением доступа
         
         Args:
             page: Объект страницы Playwright
+            response: Ответ page.goto, если известен
             
         Returns:
             bool: True, если ограничение преодолено
         """
         try:
             # Проверяем, есть ли ограничение доступа
-            if page.get_by_text("Доступ ограничен").is_visible():
+            if self._is_access_restricted(page, response):
                 log_warning("Обнаружено ограничение доступа, пытаемся его обойти")
                 
                 # Нажимаем кнопку "Обновить"
                 refresh_button = page.get_by_role("button", name="Обновить")
                 if refresh_button.is_visible():
-                    # Делаем небольшую задержку
-                    time.sleep(random.uniform(1.0, 2.0))
                     log_info("Нажимаем кнопку 'Обновить'")
                     refresh_button.click()
                     
-                    # Ждем загрузки страницы
-                    page.wait_for_load_state("networkidle")
-                    time.sleep(get_random_delay() * 2)
+                    # Ждем загрузки документа: networkidle на Озоне почти всегда уходит в тайм-аут
+                    page.wait_for_load_state("domcontentloaded")
+                    self._settle(page, "() => !document.body.innerText.includes('Доступ ограничен')", timeout=5000)
                     
                     # Проверяем, решилась ли проблема
                     if not page.get_by_text("Доступ ограничен").is_visible():
@@ -381,13 +989,8 @@ class OzonReviewParser:
             product_id = self._extract_product_id(current_url)
             
             if product_id:
-                # Формируем URL страницы отзывов
-                # Удаляем все параметры из URL
-                base_url = current_url.split('?')[0]
-                if base_url.endswith('/'):
-                    reviews_url = f"{base_url}reviews/"
-                else:
-                    reviews_url = f"{base_url}/reviews/"
+                # Формируем URL страницы отзывов без параметров и якоря
+                reviews_url = _reviews_url(current_url)
                 
                 # Проверяем, если мы уже на странице отзывов
                 if "/reviews" in current_url:
@@ -396,99 +999,50 @@ class OzonReviewParser:
                 
                 log_info(f"Прямой переход на страницу отзывов: {reviews_url}")
                 try:
-                    page.goto(reviews_url, wait_until="domcontentloaded", timeout=20000)
-                    # Используем меньший таймаут для networkidle
-                    page.wait_for_load_state("networkidle", timeout=15000)
-                    time.sleep(random.uniform(1.0, 2.0))
+                    response = page.goto(reviews_url, wait_until="domcontentloaded")
+                    # Ждем появления блока отзывов вместо networkidle
+                    self._wait_for_reviews_ready(page)
                     
-                    new_url = page.url
-                    if "/reviews" in new_url:
+                    # Виджет отзывов на месте - поиск вкладки по селекторам не нужен
+                    if (response is None or response.ok) and page.locator(REVIEW_WIDGET_SELECTOR).count() > 0:
                         log_info("Успешно перешли на страницу отзывов")
+                        self._reviews_base_url = reviews_url
+                        self._reviews_page_num = 1
                         return True
-                    else:
-                        log_warning(f"Переход по прямой ссылке не удался. Новый URL: {new_url}")
+                    
+                    log_warning(f"Переход по прямой ссылке не удался. Новый URL: {page.url}")
                 except Exception as e:
                     log_warning(f"Ошибка при прямом переходе на страницу отзывов: {e}")
                     # Продолжаем с другими методами, не прерываем выполнение
             
-            # Пробуем искать по тексту "Отзывы" или "reviews"
-            text_selectors = [
-                'a:has-text("Отзывы")',
-                'a:has-text("отзывы")',
-                'a:has-text("ОТЗЫВЫ")',
-                'a:has-text("Reviews")',
-                'a:has-text("reviews")',
-                'div:has-text("Отзывы") >> a',
-                'a:has-text("Все отзывы")',
-                'a[href*="/reviews"]',
-                'a[href*="tab=reviews"]'
-            ]
-            
-            for selector in text_selectors:
-                try:
-                    element = page.query_selector(selector)
-                    if element and element.is_visible():
-                        text = element.inner_text().strip()
-                        href = element.get_attribute("href") or ""
-                        log_info(f"Найден элемент отзывов: селектор={selector}, текст={text}, href={href}")
-                        
-                        # Прокручиваем к элементу и кликаем
-                        element.scroll_into_view_if_needed()
-                        time.sleep(random.uniform(0.5, 1.0))
-                        element.click()
-                        log_info("Нажали на элемент с отзывами")
-                        
-                        # Используем уменьшенный таймаут для networkidle
-                        try:
-                            page.wait_for_load_state("networkidle", timeout=15000)
-                        except Exception as e:
-                            log_warning(f"Таймаут при ожидании загрузки после клика: {e}")
-                            # Но продолжаем выполнение, т.к. страница могла загрузиться
-                        
-                        time.sleep(random.uniform(1.0, 2.0))
-                        return True
-                except Exception as e:
-                    log_debug(f"Ошибка при поиске селектора {selector}: {e}")
-            
-            # Если не удалось найти элементы, ищем по JavaScript элементы, содержащие "отзывы"
+            # Ищем ссылку на отзывы по тексту "Отзывы" или "reviews" одним запросом к браузеру
             try:
-                review_element = page.evaluate("""() => {
-                    // Ищем любые элементы, содержащие текст отзывы
-                    const elements = Array.from(document.querySelectorAll('a, button, div, span'))
-                        .filter(el => el.innerText && 
-                               (el.innerText.toLowerCase().includes('отзыв') || 
-                                el.innerText.toLowerCase().includes('review')));
-                    
-                    // Ищем элементы с ссылками на reviews
-                    const links = Array.from(document.querySelectorAll('a[href*="reviews"], a[href*="отзыв"]'));
-                    
-                    // Возвращаем первый найденный элемент
-                    return links.length > 0 ? links[0] : (elements.length > 0 ? elements[0] : null);
-                }""")
+                element = page.locator(self._REVIEW_TAB_SELECTOR).first
+                element.wait_for(state="visible", timeout=3000)
                 
-                if review_element:
-                    log_info("Найден элемент отзывов с помощью JavaScript")
-                    # Кликаем по найденному элементу
-                    page.evaluate("element => element.click()", review_element)
-                    log_info("Нажали на элемент отзывов с помощью JavaScript")
-                    
-                    # Используем уменьшенный таймаут
-                    try:
-                        page.wait_for_load_state("networkidle", timeout=15000)
-                    except Exception as e:
-                        log_warning(f"Таймаут при ожидании загрузки после JavaScript-клика: {e}")
-                    
-                    time.sleep(random.uniform(1.0, 2.0))
-                    return True
+                text, href = element.evaluate("el => [el.innerText.trim(), el.getAttribute('href') || '']")
+                log_info(f"Найден элемент отзывов: текст={text}, href={href}")
+                
+                # Кликаем: click сам прокручивает к элементу, если он вне экрана
+                element.click()
+                log_info("Нажали на элемент с отзывами")
+                
+                # Ждем появления блока отзывов вместо networkidle
+                if not self._wait_for_reviews_ready(page):
+                    log_warning("Блок отзывов не появился после клика")
+                    # Но продолжаем выполнение, т.к. страница могла загрузиться
+                
+                self._settle(page)
+                return True
             except Exception as e:
-                log_debug(f"Ошибка при поиске отзывов через JavaScript: {e}")
+                log_debug(f"Не удалось найти элемент отзывов по селекторам: {e}")
             
             # Если ни один из методов не сработал, пробуем перейти на страницу с якорем #reviews или #comments
             try:
                 anchor_url = f"{current_url.split('#')[0]}#reviews"
                 log_info(f"Пробуем перейти по URL с якорем: {anchor_url}")
                 page.goto(anchor_url, wait_until="domcontentloaded")
-                time.sleep(random.uniform(1.0, 2.0))
+                self._settle(page)
                 return True  # Пробуем продолжить, даже если переход по якорю не очевиден
             except Exception as e:
                 log_debug(f"Ошибка при переходе по URL с якорем: {e}")
@@ -498,8 +1052,8 @@ class OzonReviewParser:
             # Делаем скриншот только в режиме отладки
             if self.debug_mode:
                 try:
-                    screenshot_path = f"debug_no_reviews_tab_{datetime.now().strftime('%Y%m%d%H%M%S')}.png"
-                    page.screenshot(path=screenshot_path)
+                    screenshot_path = f"debug_no_reviews_tab_{_ts()}.jpg"
+                    self._save_screenshot(page, screenshot_path)
                     log_debug(f"Сделан скриншот при отсутствии вкладки отзывов: {screenshot_path}")
                 except Exception as screenshot_err:
                     log_debug(f"Не удалось сделать скриншот: {screenshot_err}")
@@ -521,72 +1075,42 @@ class OzonReviewParser:
             bool: True, если прокрутка прошла успешно, иначе False
         """
         try:
-            # Ждем загрузки контента страницы, но с ограниченным таймаутом
-            try:
-                page.wait_for_load_state("networkidle", timeout=15000)
-            except Exception as e:
-                log_warning(f"Таймаут при ожидании загрузки страницы: {e}")
+            # Ждем появления блока отзывов, но с ограниченным таймаутом
+            if not self._wait_for_reviews_ready(page):
+                log_warning("Блок отзывов не появился за отведенное время")
                 # Продолжаем выполнение, даже если произошел таймаут
             
             # Имитируем поведение человека перед прокруткой
             self._human_like_move(page)
             
             # Проверяем, нужно ли решать проблему с ограничением доступа
-            if page.get_by_text("Доступ ограничен").is_visible():
+            if self._is_access_restricted(page):
                 if not self._solve_access_restriction(page):
                     log_error("Не удалось преодолеть ограничение доступа")
                     return False
             
-            # Проверяем, есть ли на странице элементы с отзывами
-            review_indicators = [
-                'div[data-review-uuid]',
-                'div[data-widget="webReviewList"]',
-                'div[itemprop="review"]',
-                'div.review-item',
-                'div:has-text("Отзывы покупателей")',
-                'h2:has-text("Отзывы")',
-                'div:has-text("У этого товара пока нет отзывов")'
-            ]
-            
-            for selector in review_indicators:
-                try:
-                    element = page.query_selector(selector)
-                    if element and element.is_visible():
-                        log_info(f"Найден индикатор отзывов: {selector}")
-                        element.scroll_into_view_if_needed()
-                        time.sleep(random.uniform(0.5, 1.0))
-                        return True
-                except Exception as e:
-                    log_debug(f"Ошибка при поиске индикатора отзывов {selector}: {e}")
+            # Проверяем, есть ли на странице элементы с отзывами (один запрос к браузеру)
+            try:
+                element = page.locator(self._REVIEW_INDICATOR_SELECTOR).first
+                element.wait_for(state="visible", timeout=3000)
+                log_info("Найден индикатор отзывов")
+                element.scroll_into_view_if_needed()
+                self._settle(page)
+                return True
+            except Exception as e:
+                log_debug(f"Не удалось найти индикатор отзывов: {e}")
             
-            # Если не нашли прямых индикаторов, используем JavaScript для поиска текста "отзыв"
+            # Если не нашли прямых индикаторов, ищем текст "отзыв" через XPath:
+            # браузер выполняет запрос сам, без перебора всех узлов и чтения innerText
             try:
-                review_element = page.evaluate("""() => {
-                    const elements = Array.from(document.querySelectorAll('*'))
-                        .filter(el => el.innerText && 
-                               (el.innerText.toLowerCase().includes('отзыв') || 
-                                el.innerText.toLowerCase().includes('review')));
-                    
-                    // Находим самый видимый элемент
-                    for (const el of elements) {
-                        const rect = el.getBoundingClientRect();
-                        if (rect.top >= 0 && rect.left >= 0 && 
-                            rect.bottom <= (window.innerHeight || document.documentElement.clientHeight) && 
-                            rect.right <= (window.innerWidth || document.documentElement.clientWidth)) {
-                            return el;
-                        }
-                    }
-                    
-                    return elements.length > 0 ? elements[0] : null;
-                }""")
+                found = page.evaluate(_FIND_REVIEWS_TEXT_JS)
                 
-                if review_element:
-                    log_info("Найден элемент, связанный с отзывами, с помощью JavaScript")
-                    page.evaluate("element => element.scrollIntoView({behavior: 'smooth', block: 'center'})", review_element)
-                    time.sleep(random.uniform(0.5, 1.0))
+                if found:
+                    log_info("Найден элемент, связанный с отзывами, с помощью XPath")
+                    self._settle(page)
                     return True
             except Exception as e:
-                log_debug(f"Ошибка при поиске элементов отзывов через JavaScript: {e}")
+                log_debug(f"Ошибка при поиске элементов отзывов через XPath: {e}")
             
             # Если не удалось найти отзывы, пробуем общую прокрутку
             log_info("Не удалось найти конкретные элементы отзывов, выполняю общую прокрутку")
@@ -595,11 +1119,20 @@ class OzonReviewParser:
             log_error(f"Ошибка при прокрутке до секции с отзывами: {e}", exc_info=True)
             return False
     
-    def _close_browser(self):
-        """Закрытие браузера и контекста"""
+    def _close_context(self):
+        """Закрытие текущего контекста браузера"""
         try:
             if self.context:
                 self.context.close()
+        except Exception as e:
+            log_error(f"Ошибка при закрытии контекста браузера: {e}", exc_info=True)
+        finally:
+            self.context = None
+    
+    def _close_browser(self):
+        """Закрытие браузера и контекста"""
+        try:
+            self._close_context()
             if self.browser:
                 self.browser.close()
             if self.playwright:
@@ -608,6 +1141,9 @@ class OzonReviewParser:
             log_info("Браузер и контекст закрыты")
         except Exception as e:
             log_error(f"Ошибка при закрытии браузера: {e}", exc_info=True)
+        finally:
+            self.browser = None
+            self.playwright = None
     
     def _click_show_more_reviews(self, page):
         """
@@ -625,11 +1161,19 @@ class OzonReviewParser:
             
             if show_more_button and show_more_button.is_visible():
                 log_info("Нажатие на кнопку 'Показать еще отзывы'")
+                reviews_before = page.locator('div[data-review-uuid]').count()
                 show_more_button.click()
                 
-                # Ждем загрузки дополнительных отзывов
-                page.wait_for_load_state("networkidle")
-                time.sleep(get_random_delay())
+                # Ждем, пока количество отзывов на странице увеличится
+                try:
+                    page.wait_for_function(
+                        "count => document.querySelectorAll('div[data-review-uuid]').length > count",
+                        arg=reviews_before,
+                        timeout=8000
+                    )
+                except Exception as e:
+                    log_warning(f"Новые отзывы не появились после нажатия 'Показать еще': {e}")
+                self._settle(page)
                 return True
             
             return False
@@ -650,117 +1194,53 @@ class OzonReviewParser:
         try:
             log_info("Попытка перехода на следующую страницу отзывов")
             
-            # Первый метод: ищем и нажимаем кнопку "Дальше"
-            log_info("Поиск кнопки 'Дальше'...")
-            
             # Делаем скриншот для отладки
             if self.debug_mode:
-                screenshot_path = f"before_next_page_{datetime.now().strftime('%Y%m%d%H%M%S')}.png"
-                page.screenshot(path=screenshot_path)
+                screenshot_path = f"before_next_page_{_ts()}.jpg"
+                self._save_screenshot(page, screenshot_path)
                 log_debug(f"Скриншот перед переходом на следующую страницу: {screenshot_path}")
             
             # Получаем текущий URL для дальнейшего сравнения
             current_url = page.url
             
-            # Список возможных селекторов для кнопки "Дальше"
-            next_button_selectors = [
-                'div.b2122-a8:has-text("Дальше")',            # Селектор из старого кода
-                'button:has-text("Дальше")',                  # Кнопка по тексту
-                'div:has-text("Дальше"):not(:has(div))',      # Текст "Дальше" в div
-                'a:has-text("Дальше")',                       # Ссылка с текстом "Дальше"
-                'div.gp7_32:has-text("Дальше")',              # Специфический класс
-                '.paginator a.xg9_32',                        # Пагинация
-                'div[data-widget="paginator"] a:last-child',  # Последняя ссылка в пагинаторе
-                '[data-widget="paginator"] [data-test-id="next-page"]', # Тестовый ID для кнопки пагинации
-                '[data-test-id="next-page"]'                  # Тестовый ID кнопки "Следующая страница"
-            ]
-            
-            # Проверяем каждый селектор
+            # Быстрая проверка до поиска кнопки и перехода по URL: последняя ли это страница
+            state = page.evaluate(_PAGINATION_STATE_JS)
+            if state["done"]:
+                log_info("Страница отзывов последняя: следующей страницы нет")
+                return False
+            
+            # Если страница сама указывает ссылку на следующую, переходим по ней без поиска в DOM
+            next_href = state["nextHref"]
+            if next_href and next_href != current_url:
+                log_info(f"Переход по ссылке на следующую страницу: {next_href}")
+                page.goto(next_href, wait_until="domcontentloaded")
+                if self._wait_for_reviews_ready(page) and page.url != current_url:
+                    self._reviews_page_num = _page_param(page.url) or self._reviews_page_num + 1
+                    self._settle(page)
+                    return True
+                log_warning("Переход по ссылке на следующую страницу не удался")
+            
+            # Первый метод: прямой переход по URL с номером страницы - один goto без поиска кнопки в DOM
+            if self._try_direct_url_navigation(page, current_url):
+                return True
+            
+            # Второй метод: ищем и нажимаем кнопку "Дальше", если Озон не принял номер страницы в URL
+            log_info("Прямой переход не удался, поиск кнопки 'Дальше'...")
+            
+            # Проверяем все селекторы одним запросом к браузеру
             next_button = None
-            for selector in next_button_selectors:
-                try:
-                    element = page.query_selector(selector)
-                    if element and element.is_visible():
-                        log_info(f"Найдена кнопка 'Дальше' по селектору: {selector}")
-                        next_button = element
-                        break
-                except Exception as e:
-                    log_debug(f"Ошибка при поиске кнопки 'Дальше' по селектору {selector}: {e}")
+            try:
+                element = page.locator(self._NEXT_BUTTON_SELECTOR).first
+                if element.count() > 0:
+                    log_info("Найдена кнопка 'Дальше' по селекторам")
+                    next_button = element
+            except Exception as e:
+                log_debug(f"Ошибка при поиске кнопки 'Дальше' по селекторам: {e}")
             
             # Если не нашли кнопку по селекторам, ищем через JavaScript
             if not next_button:
                 log_info("Поиск кнопки 'Дальше' с помощью JavaScript...")
-                next_button_info = page.evaluate("""() => {
-                    // Ищем элементы с текстом "Дальше" или "Следующая"
-                    const elements = Array.from(document.querySelectorAll('a, button, div'))
-                        .filter(el => {
-                            const text = el.innerText?.trim().toLowerCase() || '';
-                            return text === 'дальше' || text === 'следующая' || text === 'вперед' || 
-                                   text === '→' || text === 'next' || text === '>' || text.includes('след');
-                        });
-                    
-                    if (elements.length > 0) {
-                        const element = elements[0];
-                        // Возвращаем XPath для элемента
-                        let path = '';
-                        let temp = element;
-                        while (temp && temp.nodeType === 1) {
-                            let idx = 0;
-                            let sibling = temp;
-                            while (sibling) {
-                                if (sibling.nodeType === 1 && sibling.tagName === temp.tagName) {
-                                    idx++;
-                                }
-                                sibling = sibling.previousSibling;
-                            }
-                            const tagName = temp.tagName.toLowerCase();
-                            const step = idx ? `${tagName}[${idx}]` : tagName;
-                            path = `/${step}${path}`;
-                            temp = temp.parentNode;
-                        }
-                        return {
-                            xpath: path,
-                            text: element.innerText?.trim(),
-                            isClickable: element.tagName === 'A' || element.tagName === 'BUTTON'
-                        };
-                    }
-                    
-                    // Ищем элементы с арабской цифрой, большей 1 (потенциальные страницы)
-                    const pageNumbers = Array.from(document.querySelectorAll('a, span, div'))
-                        .filter(el => {
-                            const text = el.innerText?.trim() || '';
-                            return /^[2-9][0-9]*$/.test(text); // Число больше 1
-                        })
-                        .sort((a, b) => parseInt(a.innerText) - parseInt(b.innerText));
-                    
-                    if (pageNumbers.length > 0) {
-                        // Берем элемент с наименьшим номером, большим 1
-                        const nextPageElement = pageNumbers[0];
-                        let path = '';
-                        let temp = nextPageElement;
-                        while (temp && temp.nodeType === 1) {
-                            let idx = 0;
-                            let sibling = temp;
-                            while (sibling) {
-                                if (sibling.nodeType === 1 && sibling.tagName === temp.tagName) {
-                                    idx++;
-                                }
-                                sibling = sibling.previousSibling;
-                            }
-                            const tagName = temp.tagName.toLowerCase();
-                            const step = idx ? `${tagName}[${idx}]` : tagName;
-                            path = `/${step}${path}`;
-                            temp = temp.parentNode;
-                        }
-                        return {
-                            xpath: path,
-                            text: nextPageElement.innerText?.trim(),
-                            isClickable: nextPageElement.tagName === 'A' || nextPageElement.tagName === 'BUTTON'
-                        };
-                    }
-                    
-                    return null;
-                }""")
+                next_button_info = page.evaluate(_FIND_NEXT_BUTTON_JS)
                 
                 if next_button_info:
                     log_info(f"Найдена кнопка пагинации с текстом: {next_button_info.get('text', 'Неизвестно')}")
@@ -795,48 +1275,41 @@ class OzonReviewParser:
                         # Проверяем, закрылось ли модальное окно
                         auth_modal = page.query_selector('div.vue-portal-target div.b6026-a3')
                         if auth_modal:
-                            log_warning("Не удалось закрыть модальное окно авторизации, пробую альтернативный способ навигации")
-                            # Пробуем использовать прямую навигацию по URL
-                            return self._try_direct_url_navigation(page, current_url)
+                            log_warning("Не удалось закрыть модальное окно авторизации")
+                            return False
                             
                     except Exception as e:
                         log_warning(f"Ошибка при попытке закрыть модальное окно: {e}")
-                        # Пробуем использовать прямую навигацию по URL в случае ошибки
-                        return self._try_direct_url_navigation(page, current_url)
-                
-                # Прокручиваем к кнопке и делаем её видимой
-                next_button.scroll_into_view_if_needed()
-                time.sleep(random.uniform(0.5, 1.0))
+                        return False
                 
                 try:
-                    # Нажимаем на кнопку
-                    next_button.click(timeout=10000)  # Уменьшаем таймаут для более быстрого обнаружения проблем
+                    # Нажимаем на кнопку: click сам прокручивает к ней, только если она вне экрана
+                    next_button.click()
                     log_info("Выполнен клик по кнопке 'Дальше'")
                     
-                    # Ждем загрузки страницы
-                    try:
-                        page.wait_for_load_state("networkidle", timeout=15000)
-                    except Exception as e:
-                        log_warning(f"Таймаут при ожидании загрузки страницы: {e}")
+                    # Ждем появления блока отзывов вместо networkidle
+                    if not self._wait_for_reviews_ready(page):
+                        log_warning("Блок отзывов не появился после клика")
                     
                     # Проверяем, изменился ли URL после клика
                     new_url = page.url
                     if new_url != current_url:
                         log_info(f"Успешный переход на следующую страницу. Новый URL: {new_url}")
+                        self._reviews_page_num += 1
                         
-                        # Имитируем поведение человека после загрузки новой страницы
-                        self._human_like_scroll(page)
-                        self._human_like_move(page)
+                        # Имитируем поведение человека после загрузки новой страницы (не на каждом переходе)
+                        if self._should_imitate_human():
+                            self._human_like_scroll(page)
+                            self._human_like_move(page)
                         
-                        time.sleep(random.uniform(1.0, 2.0))
+                        self._settle(page)
                         return True
                     else:
                         # Проверяем, не появилось ли модальное окно после клика
                         auth_modal = page.query_selector('div.vue-portal-target div.b6026-a3')
                         if auth_modal:
                             log_warning("После клика появилось модальное окно авторизации")
-                            # Пробуем прямую навигацию по URL
-                            return self._try_direct_url_navigation(page, current_url)
+                            return False
                         else:
                             log_warning("URL не изменился после клика, возможно, кнопка не сработала")
                 except Exception as e:
@@ -845,73 +1318,9 @@ class OzonReviewParser:
                     auth_modal = page.query_selector('div.vue-portal-target div.b6026-a3')
                     if auth_modal:
                         log_warning("После попытки клика появилось модальное окно авторизации")
-                        # Пробуем прямую навигацию по URL
-                        return self._try_direct_url_navigation(page, current_url)
                     else:
                         # Если модального окна нет, возможно другая проблема с кнопкой
-                        log_warning("Проблема с кнопкой 'Дальше', пробую прямую навигацию по URL")
-                        return self._try_direct_url_navigation(page, current_url)
-            
-            # Второй метод: пробуем построить URL напрямую, если не удалось найти кнопку
-            log_info("Попытка построить URL для следующей страницы...")
-            
-            # Если есть ?page=X в URL, заменяем X на X+1
-            if "page=" in current_url:
-                match = re.search(r'page=(\d+)', current_url)
-                if match:
-                    current_page = int(match.group(1))
-                    next_page = current_page + 1
-                    log_info(f"Текущая страница: {current_page}, переход на страницу {next_page}")
-                    
-                    next_url = re.sub(r'page=\d+', f'page={next_page}', current_url)
-                    log_info(f"Переход по прямому URL: {next_url}")
-                    
-                    try:
-                        page.goto(next_url, wait_until="domcontentloaded")
-                        page.wait_for_load_state("networkidle", timeout=15000)
-                        
-                        # Проверяем, изменился ли URL после перехода
-                        if page.url != current_url:
-                            log_info(f"Успешный переход по прямому URL на страницу {next_page}")
-                            
-                            # Имитируем поведение человека
-                            self._human_like_scroll(page)
-                            self._human_like_move(page)
-                            
-                            time.sleep(random.uniform(1.0, 2.0))
-                            return True
-                        else:
-                            log_warning("URL не изменился после перехода, возможно, страница не существует")
-                    except Exception as e:
-                        log_error(f"Ошибка при переходе по прямому URL: {e}")
-            else:
-                # Если это первая страница, добавляем page=2
-                next_url = None
-                if "?" in current_url:
-                    next_url = f"{current_url}&page=2"
-                else:
-                    next_url = f"{current_url}?page=2"
-                
-                log_info(f"Переход по прямому URL на вторую страницу: {next_url}")
-                
-                try:
-                    page.goto(next_url, wait_until="domcontentloaded")
-                    page.wait_for_load_state("networkidle", timeout=15000)
-                    
-                    # Проверяем, изменился ли URL после перехода
-                    if page.url != current_url:
-                        log_info("Успешный переход на вторую страницу по прямому URL")
-                        
-                        # Имитируем поведение человека
-                        self._human_like_scroll(page)
-                        self._human_like_move(page)
-                        
-                        time.sleep(random.uniform(1.0, 2.0))
-                        return True
-                    else:
-                        log_warning("URL не изменился после перехода, возможно, страница не существует")
-                except Exception as e:
-                    log_error(f"Ошибка при переходе по прямому URL: {e}")
+                        log_warning("Проблема с кнопкой 'Дальше'")
             
             # Если не удалось перейти ни одним способом
             log_warning("Не удалось перейти на следующую страницу отзывов")
@@ -919,8 +1328,8 @@ class OzonReviewParser:
             # Делаем скриншот для отладки
             if self.debug_mode:
                 try:
-                    screenshot_path = f"failed_next_page_{datetime.now().strftime('%Y%m%d%H%M%S')}.png"
-                    page.screenshot(path=screenshot_path)
+                    screenshot_path = f"failed_next_page_{_ts()}.jpg"
+                    self._save_screenshot(page, screenshot_path)
                     log_debug(f"Скриншот при неудачной попытке перехода: {screenshot_path}")
                 except Exception as screenshot_err:
                     log_debug(f"Не удалось сделать скриншот: {screenshot_err}")
@@ -931,12 +1340,12 @@ class OzonReviewParser:
             log_error(f"Ошибка при переходе на следующую страницу: {e}", exc_info=True)
             return False
     
-    def _parse_review_element(self, review_element, product_id, product_url):
+    def _build_review_data(self, data, product_id, product_url):
         """
-        Парсит отдельный элемент отзыва и извлекает все данные.
+        Формирует запись отзыва из полей, извлеченных на странице.
         
         Args:
-            review_element: Элемент DOM, содержащий отзыв
+            data (dict): Поля отзыва, возвращенные window.__extractReview
             product_id (str): ID продукта
             product_url (str): URL продукта
             
@@ -944,198 +1353,27 @@ class OzonReviewParser:
             dict: Данные отзыва или None в случае ошибки
         """
         try:
-            # Генерируем уникальный ID для отзыва
-            review_id = str(uuid.uuid4())
+            # Если элемент имеет атрибут data-review-uuid, используем его;
+            # случайный ID генерируем только когда атрибута нет
+            review_id = data["uuid"] or str(uuid.uuid4())
             
-            # Если элемент имеет атрибут data-review-uuid, используем его
-            uuid_attr = review_element.get_attribute('data-review-uuid')
-            if uuid_attr:
-                review_id = uuid_attr
-                log_debug(f"Найден ID отзыва в атрибуте: {review_id}")
-            
-            # СТРОГО ищем текст отзыва по указанной структуре
-            text = ""
-            try:
-                # Точная структура: div.px7_31.y4p_31 > div.x7p_31 > div > span.p7x_31
-                text_container = review_element.query_selector('div[class*="px7_"][class*="y4p_"] > div[class*="x7p_"] > div > span[class*="p7x_"]')
-                
-                if text_container:
-                    text = text_container.inner_text().strip()
-                    if text:
-                        log_debug(f"Найден текст отзыва по точной структуре: {text[:30]}...")
-                    
-                    # Проверяем, не является ли текст служебным сообщением
-                    if "Пользователь предпочёл скрыть свои данные" in text or "Количество в упаковке" in text:
-                        text = ""
-                        log_debug("Отфильтрован некорректный текст отзыва (служебное сообщение)")
-            except Exception as e:
-                log_debug(f"Ошибка при извлечении текста отзыва: {e}")
-            
-            # СТРОГО ищем автора отзыва
-            author = ""
-            try:
-                # Точная структура: span.p8u_31
-                author_element = review_element.query_selector('span[class*="p8u_"]')
-                
-                if author_element:
-                    author = author_element.inner_text().strip()
-                    log_debug(f"Найден автор отзыва: {author}")
-                    
-                    # Проверяем, не является ли автор служебным сообщением
-                    if "Пользователь предпочёл скрыть свои данные" in author:
-                        log_debug("Автор отзыва скрыт системой")
-            except Exception as e:
-                log_debug(f"Ошибка при извлечении автора отзыва: {e}")
+            text = data["text"]
+            # Проверяем, не является ли текст служебным сообщением
+            if "Пользователь предпочёл скрыть свои данные" in text or "Количество в упаковке" in text:
+                text = ""
+                log_debug("Отфильтрован некорректный текст отзыва (служебное сообщение)")
             
-            # СТРОГО ищем дату отзыва
-            date = ""
-            try:
-                # Пробуем найти дату по новому селектору
-                date_element = review_element.query_selector('div[class*="x5p_"]')
-                
-                # Если не нашли, пробуем по старому селектору
-                if not date_element:
-                    date_element = review_element.query_selector('div[class*="rv1_"]')
-                
-                if date_element:
-                    date = date_element.inner_text().strip()
-                    log_debug(f"Найдена дата отзыва: {date}")
-                else:
-                    log_debug("Не удалось найти элемент с датой отзыва")
-            except Exception as e:
-                log_debug(f"Ошибка при извлечении даты отзыва: {e}")
+            author = data["author"]
+            if "Пользователь предпочёл скрыть свои данные" in author:
+                log_debug("Автор отзыва скрыт системой")
             
-            # СТРОГО ищем вариант товара
-            product_variant = ""
-            try:
-                # Точная структура: a.y3p_31
-                variant_element = review_element.query_selector('a[class*="y3p_"]')
-                
-                if variant_element:
-                    product_variant = variant_element.inner_text().strip()
-                    log_debug(f"Найден вариант товара: {product_variant}")
-            except Exception as e:
-                log_debug(f"Ошибка при извлечении варианта товара: {e}")
+            date = data["date"]
+            if not date:
+                log_debug("Не удалось найти элемент с датой отзыва")
             
-            # СТРОГО ищем рейтинг (количество звезд)
-            rating = 0
-            try:
-                # На основе предоставленной структуры HTML, точное определение контейнера
-                # Первичный селектор: div.p6x_31 > div.a5d25-a
-                rating_container = review_element.query_selector('div[class*="p6x_"] > div[class*="a5d25-a"]')
-                
-                if not rating_container:
-                    # Альтернативный поиск, если точная структура не найдена
-                    rating_container = review_element.query_selector('div[class*="p6x_"], div[class*="a5d25-a"]')
-                
-                if rating_container:
-                    log_debug("Найден контейнер для рейтинга")
-                    
-                    # Используем JavaScript для определения количества оранжевых звезд
-                    filled_stars = rating_container.evaluate("""(container) => {
-                        // Ищем все SVG элементы внутри контейнера
-                        const svgElements = Array.from(container.querySelectorAll('svg'));
-                        
-                        // Считаем количество SVG с оранжевым цветом (rgb(255, 165, 0))
-                        const filledStars = svgElements.filter(svg => {
-                            const style = svg.getAttribute('style') || '';
-                            return style.includes('rgb(255, 165, 0)') || 
-                                  style.includes('rgb(255,165,0)') ||
-                                  style.includes('color: rgb(255, 165, 0)') ||
-                                  style.includes('orange');
-                        });
-                        
-                        return filledStars.length;
-                    }""")
-                    
-                    if filled_stars and 0 < filled_stars <= 5:
-                        rating = filled_stars
-                        log_debug(f"Найдено {filled_stars} оранжевых звезд с помощью точного селектора")
-                    else:
-                        log_debug("Не удалось определить рейтинг по точному критерию, пробуем альтернативные методы")
-                        
-                        # Способ 2: Подсчет через CSS селекторы для разных форматов цвета
-                        selectors = [
-                            'svg[style*="color: rgb(255"]',
-                            'svg[style*="orange"]',
-                            'svg[style*="rgb(255, 165"]',
-                            'svg[style*="#f"]',
-                            'svg[fill*="#f"]',
-                            'svg[fill="currentColor"]'
-                        ]
-                        
-                        for selector in selectors:
-                            stars = rating_container.query_selector_all(selector)
-                            if stars and 0 < len(stars) <= 5:
-                                rating = len(stars)
-                                log_debug(f"Найдено {rating} SVG-звезд по селектору {selector}")
-                                break
-                        
-                        # Способ 3: Подсчет через JavaScript с более широкими критериями
-                        if rating == 0:
-                            js_count = rating_container.evaluate("""(container) => {
-                                // Ищем все SVG элементы внутри контейнера
-                                const svgElements = container.querySelectorAll('svg');
-                                
-                                // Подсчитываем SVG с оранжевым цветом (любой оттенок)
-                                let count = 0;
-                                for (const svg of svgElements) {
-                                    const style = window.getComputedStyle(svg);
-                                    const colorStyle = svg.getAttribute('style') || '';
-                                    const fillColor = svg.getAttribute('fill') || '';
-                                    
-                                    // Проверяем различные форматы цвета: RGB, HEX, названия
-                                    if (
-                                        (style.color && style.color.includes('255')) || // rgb содержит 255 (красный)
-                                        colorStyle.includes('rgb(255') || 
-                                        colorStyle.includes('orange') || 
-                                        colorStyle.includes('gold') ||
-                                        colorStyle.includes('#f') || // hex цвета с буквой f
-                                        fillColor.includes('#f') ||
-                                        fillColor.includes('orange') ||
-                                        fillColor.includes('gold')
-                                    ) {
-                                        count++;
-                                    }
-                                    
-                                    // Также проверяем, есть ли path с fill="currentColor"
-                                    const paths = svg.querySelectorAll('path[fill="currentColor"]');
-                                    if (paths.length > 0 && (
-                                        colorStyle.includes('rgb(255') || 
-                                        colorStyle.includes('orange') || 
-                                        colorStyle.includes('gold') ||
-                                        colorStyle.includes('#f')
-                                    )) {
-                                        if (count === 0) count++; // Добавляем, только если еще не считали эту звезду
-                                    }
-                                }
-                                
-                                return count;
-                            }""")
-                            
-                            if js_count and 0 < js_count <= 5:
-                                rating = js_count
-                                log_debug(f"Найдено {rating} SVG-звезд с помощью расширенного JavaScript")
-                        
-                        # Способ 4: Если все не помогло, просто считаем количество SVG (для стабильности)
-                        if rating == 0:
-                            # Считаем первые SVG элементы, которые не имеют rgba в стиле (обычно это заполненные звезды)
-                            filled_count = rating_container.evaluate("""(container) => {
-                                const svgs = Array.from(container.querySelectorAll('svg'));
-                                // Отфильтровываем SVG элементы, у которых нет rgba в стиле
-                                return svgs.filter(svg => {
-                                    const style = svg.getAttribute('style') || '';
-                                    return !style.includes('rgba');
-                                }).length;
-                            }""")
-                            
-                            if filled_count and 0 < filled_count <= 5:
-                                rating = filled_count
-                                log_debug(f"Определено примерное количество звезд: {rating} (путем исключения неокрашенных)")
-                    
-                    log_debug(f"Итоговый рейтинг отзыва: {rating}")
-            except Exception as e:
-                log_error(f"Ошибка при извлечении рейтинга отзыва: {e}", exc_info=True)
+            product_variant = data["variant"]
+            rating = data["rating"]
+            log_debug("Отзыв %s: автор=%s, дата=%s, рейтинг=%s", review_id, author, date, rating)
             
             # Создаем словарь с данными отзыва
             review_data = {
@@ -1152,194 +1390,9 @@ class OzonReviewParser:
             return review_data
             
         except Exception as e:
-            log_error(f"Ошибка при парсинге элемента отзыва: {e}")
+            log_error(f"Ошибка при обработке данных отзыва: {e}")
             return None
     
-    def _parse_review(self, review_element, product_id, product_url):
-        """
-        Прокси к _parse_review_element для обратной совместимости
-        
-        Args:
-            review_element: Элемент DOM, содержащий отзыв
-            product_id (str): ID продукта
-            product_url (str): URL продукта
-            
-        Returns:
-            dict: Данные отзыва или None в случае ошибки
-        """
-        return self._parse_review_element(review_element, product_id, product_url)
-    
-    def _find_review_container(self, page):
-        """
-        Находит контейнер с отзывами на странице
-        
-        Args:
-            page: Объект страницы Playwright
-            
-        Returns:
-            tuple: (container_element, selector) или (None, None), если не найден
-        """
-        try:
-            log_info("Поиск контейнера с отзывами...")
-            
-            # Расширенный список селекторов для поиска контейнера с отзывами
-            container_selectors = [
-                # Селекторы из скриншота
-                'div.r9u_32',          # Контейнер с отзывами (из скриншота)
-                'div:has(span.y4p_32)', # Контейнер, содержащий элемент с текстом отзыва
-                'div.pz0_32',          # Еще один контейнер из скриншота
-                
-                # Селекторы, связанные с виджетами отзывов
-                'div[data-widget="webReviews"]',
-                'div[data-widget="webReviewsList"]',
-                'div[data-widget="webReviewList"]',
-                'div[data-widget="reviews"]',
-                'div[data-widget="webReviewContainer"]',
-                'div[data-widget="searchResultsV2"]',
-                
-                # Селекторы по классам и структуре
-                'div.widget-search-result-container',
-                'div.review-grid',
-                
-                # Селекторы контейнеров, содержащих отзывы
-                'div:has(div[data-review-uuid])',
-                'div:has([itemprop="review"])',
-                
-                # Более общие селекторы
-                'div.container-reviews',
-                'div:has-text("Отзывы о товаре")',
-                'div:has(div:has-text("Отзывы покупателей"))'
-            ]
-            
-            # Проверяем видимые элементы сначала
-            for selector in container_selectors:
-                log_info(f"Проверка селектора: {selector}")
-                container = page.query_selector(selector)
-                if container and container.is_visible():
-                    log_info(f"Найден контейнер отзывов по селектору: {selector}")
-                    return container, selector
-            
-            # Если не нашли по селекторам, проверяем наличие элементов с классами из скриншота
-            possible_review_classes = [
-                'r9u_32',     # Контейнер отзыва
-                'pz0_32',     # Контейнер элементов отзыва
-                'y4p_32',     # Элемент с текстом отзыва
-                'vp5_32'      # Элемент с рейтингом (звезды)
-            ]
-            
-            # Ищем элементы с характерными классами
-            for class_name in possible_review_classes:
-                elements = page.query_selector_all(f'.{class_name}')
-                if elements and len(elements) > 0:
-                    log_info(f"Найдены элементы с классом {class_name} (количество: {len(elements)})")
-                    
-                    # Для класса текста отзыва ищем родительский контейнер
-                    if class_name == 'y4p_32':
-                        parent = elements[0].evaluate("""(element) => {
-                            // Ищем родителя, который может быть контейнером всех отзывов
-                            let parent = element.parentElement;
-                            for (let i = 0; i < 5; i++) { // Проверяем до 5 уровней вверх
-                                if (!parent) return null;
-                                // Проверяем, содержит ли родитель другие похожие элементы
-                                const siblings = parent.querySelectorAll('.y4p_32, .vp5_32, [class*="r9u_"], [class*="pz0_"]');
-                                if (siblings.length > 1) {
-                                    return parent;
-                                }
-                                parent = parent.parentElement;
-                            }
-                            return null;
-                        }""")
-                        
-                        if parent:
-                            log_info("Найден родительский контейнер для элементов отзывов")
-                            return parent, "parent-of-y4p_32"
-                    
-                    # Для контейнера отзывов просто возвращаем первый элемент
-                    if class_name == 'r9u_32' or class_name == 'pz0_32':
-                        log_info(f"Возвращаем контейнер с классом {class_name}")
-                        return elements[0], f".{class_name}"
-            
-            # Если не нашли по классам, ищем элементы с текстом, который может быть отзывом
-            log_info("Поиск элементов, содержащих длинный текст (возможные отзывы)")
-            
-            # Используем JavaScript для поиска элементов с длинным текстом
-            potential_reviews = page.evaluate("""() => {
-                // Ищем элементы с непустым текстом длиной более 50 символов
-                const potentialReviews = [];
-                
-                // Все элементы с видимым текстом
-                const elements = Array.from(document.querySelectorAll('*'));
-                for (const el of elements) {
-                    const text = el.innerText?.trim();
-                    // Проверяем, что текст достаточно длинный и не является навигационным/служебным
-                    if (text && text.length > 50 && 
-                        !el.tagName.match(/^(HTML|BODY|HEAD|SCRIPT|STYLE|LINK|META)$/i) &&
-                        !text.includes('JavaScript') && 
-                        !text.includes('DOCTYPE') &&
-                        !el.closest('header') && 
-                        !el.closest('footer') && 
-                        !el.closest('nav')) {
-                        
-                        // Добавляем путь до элемента для идентификации
-                        let path = '';
-                        let node = el;
-                        while (node) {
-                            if (node.id) {
-                                path = `#${node.id} > ${path}`;
-                                break;
-                            } else if (node.className) {
-                                path = `.${node.className.split(' ').join('.')} > ${path}`;
-                            } else {
-                                path = `${node.tagName.toLowerCase()} > ${path}`;
-                            }
-                            node = node.parentElement;
-                        }
-                        
-                        potentialReviews.push({
-                            path: path,
-                            textLength: text.length,
-                            textSample: text.substring(0, 100) + '...'
-                        });
-                    }
-                }
-                
-                // Сортируем по длине текста (более длинные сначала)
-                return potentialReviews.sort((a, b) => b.textLength - a.textLength).slice(0, 5);
-            }""")
-            
-            if potential_reviews and len(potential_reviews) > 0:
-                log_info("Найдены потенциальные элементы с текстом отзывов:")
-                for i, review in enumerate(potential_reviews):
-                    log_info(f"  {i+1}. Путь: {review['path']}, длина текста: {review['textLength']}, пример: {review['textSample']}")
-                
-                # Пробуем найти контейнер для первого потенциального отзыва
-                first_review_path = potential_reviews[0]['path']
-                try:
-                    # Извлекаем селектор из пути
-                    selector = first_review_path.split(' > ')[0].strip()
-                    log_info(f"Пробуем использовать селектор: {selector}")
-                    
-                    element = page.query_selector(selector)
-                    if element:
-                        log_info(f"Найден элемент с потенциальным отзывом: {selector}")
-                        return element, "potential-review-text"
-                except Exception as e:
-                    log_debug(f"Ошибка при обработке потенциального отзыва: {e}")
-            
-            # Если все ещё не нашли, ищем любые элементы с текстом "отзыв" и делаем скриншот страницы
-            log_warning("Не удалось найти контейнер с отзывами")
-            
-            # Делаем скриншот страницы для отладки
-            screenshot_path = "reviews_page_debug.png"
-            page.screenshot(path=screenshot_path)
-            log_info(f"Сделан скриншот страницы для отладки: {screenshot_path}")
-            
-            return None, None
-        
-        except Exception as e:
-            log_error(f"Ошибка при поиске контейнера с отзывами: {e}", exc_info=True)
-            return None, None
-    
     def _collect_reviews_from_page(self, page, product_id, product_url):
         """
         Собирает отзывы со страницы, находя элементы с атрибутом data-review-uuid.
@@ -1356,155 +1409,102 @@ class OzonReviewParser:
         reviews = []
         
         try:
-            # Делаем скриншот страницы для отладки
-            screenshot_path = f"debug_reviews_page_{datetime.now().strftime('%Y%m%d%H%M%S')}.png"
-            page.screenshot(path=screenshot_path)
-            log_debug(f"Сделан скриншот страницы отзывов: {screenshot_path}")
-            
-            # Сохраняем HTML для анализа структуры
-            html_path = f"debug_reviews_page_{datetime.now().strftime('%Y%m%d%H%M%S')}.html"
-            with open(html_path, "w", encoding="utf-8") as f:
-                f.write(page.content())
-            log_debug(f"Сохранен HTML страницы отзывов: {html_path}")
+            # Скриншот и HTML страницы сохраняем только в режиме отладки
+            if self.debug_mode:
+                # Одна метка времени на пару файлов, чтобы скриншот и HTML имели одинаковые имена
+                ts = _ts()
+                screenshot_path = f"debug_reviews_page_{ts}.jpg"
+                self._save_screenshot(page, screenshot_path)
+                log_debug(f"Сделан скриншот страницы отзывов: {screenshot_path}")
+                
+                # Сохраняем HTML для анализа структуры
+                html_path = f"debug_reviews_page_{ts}.html.gz"
+                self._save_html(page, html_path)
+                log_debug(f"Сохранен HTML страницы отзывов: {html_path}")
             
             # Логируем текущий URL для отладки
             log_info(f"Текущий URL при сборе отзывов: {page.url}")
             
-            # Ждем немного, чтобы страница полностью загрузилась
-            time.sleep(random.uniform(1.0, 2.0))
-            
-            # Проверяем наличие сообщения "нет отзывов"
-            if page.query_selector('div:has-text("У этого товара пока нет отзывов")') or page.query_selector('div:has-text("Еще нет отзывов")'):
-                log_info("На странице есть сообщение 'Нет отзывов'")
-                return []
-            
-            # Ждем появления элементов отзывов с таймаутом
+            # Ждем появления в DOM отзывов или сообщения об их отсутствии - что наступит раньше
+            no_reviews_message = 'div:has-text("У этого товара пока нет отзывов"), div:has-text("Еще нет отзывов")'
             try:
-                page.wait_for_selector('div[data-review-uuid], div[data-widget="webReviewList"] > div', timeout=10000)
-                log_info("Найдены элементы отзывов на странице")
+                page.wait_for_selector(
+                    f'div[data-review-uuid], div[data-widget="webReviewList"] > div, {no_reviews_message}',
+                    state="attached", timeout=10000
+                )
             except Exception as e:
                 log_warning(f"Таймаут при ожидании элементов отзывов: {e}")
             
-            # Ищем элементы отзывов напрямую по атрибуту data-review-uuid
-            review_elements = page.query_selector_all('div[data-review-uuid]')
-            log_info(f"Найдено {len(review_elements)} элементов с атрибутом data-review-uuid")
+            # Ищем элементы отзывов напрямую по атрибуту data-review-uuid.
+            # Здесь только подбирается селектор: сами элементы в Python не передаются
+            review_selector = 'div[data-review-uuid]'
+            review_count = page.evaluate(_COUNT_CALL, review_selector)
+            log_info(f"Найдено {review_count} элементов с атрибутом data-review-uuid")
             
             # Проверяем, что мы нашли отзывы
-            if not review_elements or len(review_elements) == 0:
+            host = None
+            if not review_count:
                 log_warning("Не найдено отзывов с атрибутом data-review-uuid, ищем альтернативными способами")
                 
-                # Список альтернативных селекторов для поиска отзывов
-                alternative_selectors = [
-                    'div[data-widget="webReviewList"] > div',
-                    'div[itemprop="review"]',
-                    'div.rv3_32 > div',  # Из скриншота
-                    'div.r0o_32',        # Из скриншота
-                    'div.rw5_32',        # Из скриншота
-                    'div:has(span.y4p_32)',  # Контейнер с текстом отзыва
-                    'div:has(div.vp5_32)',   # Контейнер с рейтингом (звезды)
-                    'div:has(div.r0o_32)',   # Контейнер с данными автора
-                    'div.review-item',
-                    'div.rc1_32'          # Еще один класс из структуры
-                ]
+                # Селектор, сработавший для этого сайта раньше (в том числе на прошлых запусках), проверяем первым
+                alternative_selectors = list(self._ALT_REVIEW_SELECTORS)
+                host = urlsplit(product_url).hostname
+                cached_selector = self._learned_selectors.get(host)
+                if cached_selector:
+                    alternative_selectors.insert(0, cached_selector)
                 
-                # Пробуем каждый селектор
-                for selector in alternative_selectors:
-                    try:
-                        elements = page.query_selector_all(selector)
-                        if elements and len(elements) > 0:
-                            log_info(f"Найдено {len(elements)} элементов по селектору {selector}")
-                            review_elements = elements
-                            break
-                    except Exception as e:
-                        log_debug(f"Ошибка при поиске элементов по селектору {selector}: {e}")
+                # Проверяем все селекторы за один запрос к браузеру
+                try:
+                    index, count = page.evaluate(_FIRST_MATCHING_JS, alternative_selectors)
+                    if index >= 0:
+                        review_selector, review_count = alternative_selectors[index], count
+                        log_info(f"Найдено {count} элементов по селектору {review_selector}")
+                except Exception as e:
+                    log_debug(f"Ошибка при поиске элементов по альтернативным селекторам: {e}")
                 
                 # Если все еще не нашли элементы, ищем с помощью JavaScript
-                if not review_elements or len(review_elements) == 0:
+                if not review_count:
                     log_warning("Не найдено отзывов по альтернативным селекторам, поиск через JavaScript")
                     
-                    # Пробуем найти элементы через JavaScript
-                    js_elements = page.evaluate("""() => {
-                        // Функция для поиска потенциальных контейнеров отзывов
-                        function findPotentialReviews() {
-                            // Ищем элементы с классами, содержащими определенные паттерны
-                            const classPatterns = ['review', 'otziv', 'rv', 'r0o', 'y4p', 'vp5'];
-                            
-                            // Находим все элементы с подходящими классами
-                            const elements = [];
-                            for (const pattern of classPatterns) {
-                                const matches = document.querySelectorAll(`[class*="${pattern}"]`);
-                                for (const match of matches) {
-                                    elements.push(match);
-                                }
-                            }
-                            
-                            // Ищем контейнеры, которые могут содержать несколько похожих элементов
-                            const containers = new Map();
-                            for (const el of elements) {
-                                // Проверяем 3 уровня родителей
-                                let parent = el.parentElement;
-                                for (let i = 0; i < 3 && parent; i++) {
-                                    if (!containers.has(parent)) {
-                                        containers.set(parent, 0);
-                                    }
-                                    containers.set(parent, containers.get(parent) + 1);
-                                    parent = parent.parentElement;
-                                }
-                            }
-                            
-                            // Находим контейнеры с наибольшим количеством подходящих элементов
-                            const potentialContainers = Array.from(containers.entries())
-                                .filter(([_, count]) => count > 2)  // Минимум 3 подходящих элемента
-                                .sort(([_, countA], [__, countB]) => countB - countA);
-                            
-                            return potentialContainers.length > 0 ? 
-                                potentialContainers[0][0].outerHTML : null;
-                        }
-                        
-                        return findPotentialReviews();
-                    }""")
-                    
-                    if js_elements:
-                        log_info("Найдены потенциальные элементы отзывов через JavaScript")
-                        # Здесь мы не можем напрямую использовать результат, 
-                        # так как JavaScript вернул HTML строку, а не элементы DOM
-                        log_debug("JavaScript вернул HTML потенциальных отзывов, но не элементы DOM")
-                        
-                        # Повторяем проверку наличия элементов после JavaScript-анализа
-                        for selector in alternative_selectors:
-                            elements = page.query_selector_all(selector)
-                            if elements and len(elements) > 0:
-                                log_info(f"После JavaScript-анализа найдено {len(elements)} элементов по селектору {selector}")
-                                review_elements = elements
-                                break
+                    # JavaScript находит контейнер и возвращает селектор его элементов
+                    js_selector = page.evaluate(_POTENTIAL_REVIEWS_SELECTOR_JS)
+                    if js_selector:
+                        count = page.evaluate(_COUNT_CALL, js_selector)
+                        if count > 0:
+                            review_selector, review_count = js_selector, count
+                            log_info(f"Через JavaScript найдено {count} элементов по селектору {review_selector}")
             
             # Если нашли элементы отзывов, обрабатываем их
-            if review_elements and len(review_elements) > 0:
-                log_info(f"Найдено {len(review_elements)} элементов отзывов на странице")
+            if review_count:
+                log_info(f"Найдено {review_count} элементов отзывов на странице")
                 
-                # Обрабатываем каждый элемент отзыва
-                for element in review_elements:
-                    review_data = self._parse_review_element(element, product_id, product_url)
+                # Извлекаем все отзывы страницы одним вызовом evaluate
+                for data in page.evaluate(_EXTRACT_ALL_CALL, review_selector):
+                    review_data = self._build_review_data(data, product_id, product_url)
                     if review_data:
                         reviews.append(review_data)
                 
+                # Запоминаем альтернативный селектор для следующих страниц и товаров этого сайта,
+                # только если по нему действительно извлеклись отзывы. Сохраненный селектор,
+                # который перестал находить отзывы, забываем
+                if host:
+                    if _looks_like_reviews(reviews):
+                        if self._learned_selectors.get(host) != review_selector:
+                            self._learned_selectors[host] = review_selector
+                            self._learned_selector_updates[host] = review_selector
+                    elif self._learned_selectors.get(host) == review_selector:
+                        del self._learned_selectors[host]
+                        self._learned_selector_updates[host] = None
+                
                 log_info(f"Успешно собрано {len(reviews)} отзывов со страницы")
                 return reviews
             else:
                 log_warning("Не удалось найти элементы отзывов на странице")
                 
-                # Проверяем наличие индикаторов отсутствия отзывов
-                no_reviews_selectors = [
-                    'div:has-text("У этого товара пока нет отзывов")',
-                    'div:has-text("Отзывов пока нет")',
-                    'div:has-text("Нет отзывов")',
-                    'div:has-text("Еще нет отзывов")'
-                ]
-                
-                for selector in no_reviews_selectors:
-                    if page.query_selector(selector):
-                        log_info(f"Найдено сообщение об отсутствии отзывов: {selector}")
-                        return []
+                # Сообщение об отсутствии отзывов проверяем только когда ни один селектор ничего не нашел
+                if page.evaluate(NO_REVIEWS_JS):
+                    log_info("Найдено сообщение об отсутствии отзывов")
+                    return []
                 
                 return []
                 
@@ -1512,46 +1512,23 @@ class OzonReviewParser:
             log_error(f"Ошибка при сборе отзывов со страницы: {e}", exc_info=True)
             return []
     
-    def _validate_review_elements(self, elements):
+    def _parse_review_date(self, date_str):
         """
-        Проверяет, что найденные элементы действительно являются отзывами
+        Преобразует строку с датой отзыва в объект datetime.
         
         Args:
-            elements: список элементов для проверки
+            date_str (str): Дата отзыва в одном из форматов Озона
             
         Returns:
-            bool: True, если элементы похожи на отзывы
+            datetime: Дата отзыва (текущая дата, если формат не распознан)
         """
-        # Если элементов слишком мало, это вряд ли список отзывов
-        if len(elements) < 2:
-            return False
-            
-        # Проверяем первые несколько элементов на наличие типичных признаков отзыва
-        valid_elements = 0
-        for i in range(min(3, len(elements))):
-            element = elements[i]
-            
-            try:
-                # Проверяем наличие текста отзыва
-                text_elements = element.query_selector_all('span[class*="y4p_"], div[class*="r8p_"], div[class*="wp4_"]')
-                has_text = len(text_elements) > 0 and any(el.inner_text().strip() for el in text_elements)
-                
-                # Проверяем наличие звездного рейтинга
-                rating_elements = element.query_selector_all('div[class*="vp5_"], svg[fill="#f9c000"], svg[fill="#ffb800"]')
-                has_rating = len(rating_elements) > 0
-                
-                # Проверяем наличие даты или имени автора
-                author_date_elements = element.query_selector_all('div[class*="rv0_"], div[class*="rv1_"], div[class*="r1c_"], div[class*="x5p_"]')
-                has_author_date = len(author_date_elements) > 0
-                
-                # Считаем элемент валидным, если есть хотя бы два из трех признаков
-                if (has_text and has_rating) or (has_text and has_author_date) or (has_rating and has_author_date):
-                    valid_elements += 1
-            except Exception as e:
-                log_debug(f"Ошибка при проверке элемента на валидность: {e}")
-                
-        # Если большинство проверенных элементов похожи на отзывы, считаем всю группу валидной
-        return valid_elements >= min(2, len(elements))
+        review_date = _match_review_date(date_str)
+        if review_date is not None:
+            return review_date
+        
+        # Если ничего не подошло, используем текущую дату
+        log_warning(f"Неизвестный формат даты: {date_str}, используем текущую дату")
+        return datetime.now()
     
     def _is_newer_review(self, review, last_review_date, last_review_ids=None):
         """
@@ -1559,8 +1536,9 @@ class OzonReviewParser:
         
         Args:
             review (dict): Отзыв для проверки
-            last_review_date (str): Дата последнего собранного отзыва
-            last_review_ids (list): Список ID последних собранных отзывов
+            last_review_date (str | datetime): Дата последнего собранного отзыва
+                (уже разобранную дату можно передать, чтобы не разбирать ее для каждого отзыва)
+            last_review_ids (list | set): ID последних собранных отзывов
             
         Returns:
             bool: True, если отзыв новее или еще не собран, False в противном случае
@@ -1572,7 +1550,7 @@ class OzonReviewParser:
         # Сначала проверяем ID отзыва
         if last_review_ids and 'review_id' in review:
             if review['review_id'] in last_review_ids:
-                log_debug(f"Отзыв с ID {review['review_id']} уже собран")
+                log_debug("Отзыв с ID %s уже собран", review['review_id'])
                 return False
                 
         # Если дата отзыва не указана, считаем, что он новый
@@ -1580,51 +1558,12 @@ class OzonReviewParser:
             return True
             
         try:
-            # Обрабатываем разные форматы дат
-            review_date_str = review['date']
-            last_date_str = last_review_date
-            
-            # Функция для преобразования строки в дату
-            def parse_date(date_str):
-                # Если формат DD.MM.YYYY
-                if re.match(r'\d{1,2}\.\d{1,2}\.\d{4}', date_str):
-                    day, month, year = map(int, date_str.split('.'))
-                    return datetime(year, month, day)
-                
-                # Если формат "30 марта 2025" или похожий
-                months_ru = {
-                    'января': 1, 'февраля': 2, 'марта': 3, 'апреля': 4, 'мая': 5, 'июня': 6,
-                    'июля': 7, 'августа': 8, 'сентября': 9, 'октября': 10, 'ноября': 11, 'декабря': 12
-                }
-                
-                match = re.match(r'(\d{1,2})\s+([а-яА-Я]+)\s+(\d{4})', date_str)
-                if match:
-                    day = int(match.group(1))
-                    month_name = match.group(2).lower()
-                    year = int(match.group(3))
-                    
-                    if month_name in months_ru:
-                        month = months_ru[month_name]
-                        return datetime(year, month, day)
-                
-                # Если дата в формате ISO (YYYY-MM-DD)
-                try:
-                    return datetime.fromisoformat(date_str)
-                except ValueError:
-                    pass
-                
-                # Если формат DD/MM/YYYY
-                if re.match(r'\d{1,2}/\d{1,2}/\d{4}', date_str):
-                    day, month, year = map(int, date_str.split('/'))
-                    return datetime(year, month, day)
-                
-                # Если ничего не подошло, используем текущую дату
-                log_warning(f"Неизвестный формат даты: {date_str}, используем текущую дату")
-                return datetime.now()
+            review_date = self._parse_review_date(review['date'])
             
-            # Конвертируем строки в объекты datetime
-            review_date = parse_date(review_date_str)
-            last_date = parse_date(last_date_str)
+            if isinstance(last_review_date, datetime):
+                last_date = last_review_date
+            else:
+                last_date = self._parse_review_date(last_review_date)
             
             # Отзыв новее, если его дата больше даты последнего отзыва
             return review_date >= last_date
@@ -1633,7 +1572,7 @@ class OzonReviewParser:
             # В случае ошибки считаем, что отзыв новый
             return True
     
-    def parse_product_reviews(self, product_url, max_reviews=None, incremental=None):
+    def parse_product_reviews(self, product_url, max_reviews=None, incremental=None, page=None):
         """
         Основной метод для парсинга отзывов о продукте.
         
@@ -1641,6 +1580,8 @@ class OzonReviewParser:
             product_url (str): URL страницы продукта
             max_reviews (int, optional): Максимальное количество отзывов для сбора
             incremental (bool, optional): Флаг инкрементного парсинга
+            page (optional): Уже открытая страница Playwright. Если передана, используется
+                вместо отдельных контекста и страницы для товара и не закрывается
             
         Returns:
             list: Список собранных отзывов
@@ -1666,11 +1607,12 @@ class OzonReviewParser:
         
         # Для инкрементного парсинга получаем дату последнего отзыва и список ID
         last_review_date = None
-        last_review_ids = []
+        last_review_ids = frozenset()
         
         if incremental:
             last_review_date = self.db.get_last_review_date(product_id)
-            last_review_ids = self.db.get_last_review_ids(product_id)
+            # Множество вместо списка: проверка ID для каждого отзыва за O(1)
+            last_review_ids = frozenset(self.db.get_last_review_ids(product_id))
             
             if last_review_date:
                 log_info(f"Дата последнего собранного отзыва: {last_review_date}")
@@ -1678,24 +1620,27 @@ class OzonReviewParser:
             else:
                 log_info("Нет данных о предыдущих отзывах, выполняем полный парсинг")
         
-        # Инициализируем браузер
-        if not self.browser:
-            self._initialize_browser()
-        
-        # Открываем новую страницу
-        page = self.context.new_page()
+        own_page = page is None
+        if own_page:
+            # Запускаем браузер (один раз на все товары) и создаем отдельный контекст для товара
+            if not self._ensure_browser() or not self._new_context():
+                log_error("Не удалось подготовить браузер для парсинга")
+                return []
+            
+            # Открываем новую страницу
+            page = self.context.new_page()
         
         all_reviews = []
         try:
             # Формируем URL страницы отзывов (просто добавляем /reviews/)
-            base_url = product_url.split('?')[0]
-            if base_url.endswith('/'):
-                reviews_url = f"{base_url}reviews/"
-            else:
-                reviews_url = f"{base_url}/reviews/"
+            reviews_url = _reviews_url(product_url)
             
             log_info(f"Переход напрямую на страницу отзывов: {reviews_url}")
             
+            # Запоминаем адрес отзывов для навигации по страницам
+            self._reviews_base_url = reviews_url
+            self._reviews_page_num = 1
+            
             # Открываем страницу отзывов
             if not self._open_page(page, reviews_url):
                 log_error("Не удалось открыть страницу отзывов, пробуем основной URL")
@@ -1714,67 +1659,131 @@ class OzonReviewParser:
             # Выполняем прокрутку для лучшей загрузки контента
             self._human_like_scroll(page)
             
-            # Сохраняем все необработанные отзывы со всех страниц
-            raw_reviews = []
+            # Количество необработанных отзывов со всех страниц
+            raw_count = 0
             
             # Проходим по всем страницам отзывов и собираем их
             page_num = 1
             stop_parsing = False
+            seen_review_ids = set()
             
-            while not stop_parsing:
-                log_info(f"Обработка страницы отзывов #{page_num}")
-                
-                # Собираем отзывы с текущей страницы
-                page_reviews = self._collect_reviews_from_page(page, product_id, product_url)
-                
-                # Сохраняем необработанные отзывы
-                raw_reviews.extend(page_reviews)
-                
-                log_info(f"Собрано {len(page_reviews)} отзывов на странице #{page_num}")
-                
-                if not page_reviews:
-                    log_info("На этой странице не найдено отзывов, завершаем парсинг")
-                    break
-                
-                # Проверяем ограничение по количеству для сырых отзывов
-                if max_reviews and len(raw_reviews) >= max_reviews:
-                    log_info(f"Достигнут лимит в {max_reviews} отзывов (до фильтрации)")
-                    break
-                
-                # Попробуем перейти на следующую страницу
-                if not self._navigate_to_next_reviews_page(page):
-                    log_info("Больше нет страниц с отзывами")
-                    break
-                
-                # Увеличиваем номер страницы и делаем паузу перед обработкой следующей
-                page_num += 1
-                log_info(f"Переход к обработке страницы отзывов #{page_num}")
-                time.sleep(random.uniform(1.0, 2.0))
-            
-            log_info(f"Всего собрано {len(raw_reviews)} отзывов со всех страниц (до фильтрации)")
-            
-            # Фильтруем отзывы для инкрементного парсинга
-            if incremental and last_review_date and raw_reviews:
-                # Проверяем каждый отзыв
-                new_reviews = []
-                for review in raw_reviews:
-                    if self._is_newer_review(review, last_review_date, last_review_ids):
-                        new_reviews.append(review)
-                
-                log_info(f"После фильтрации по дате осталось {len(new_reviews)} новых отзывов из {len(raw_reviews)}")
-                all_reviews = new_reviews
-            else:
-                all_reviews = raw_reviews
+            # Рассчитываем паузы между страницами заранее, а не на каждой итерации
+            page_delays = get_delay_schedule(PAGE_DELAY_SCHEDULE_SIZE)
+            
+            # Конвейер: основной поток листает страницы (Playwright работает только в нем),
+            # а фильтрация собранных отзывов идет в отдельном потоке, пока грузится следующая страница
+            pages_queue = queue.Queue(maxsize=4)
+            processed_reviews = []
+            filter_by_date = incremental and last_review_date
+            
+            # Дата последнего отзыва разбирается один раз на товар
+            if filter_by_date:
+                last_date = self._parse_review_date(last_review_date)
+            
+            # Устанавливается потоком обработки, когда дошли до уже собранных отзывов
+            caught_up = threading.Event()
+            
+            def process_pages():
+                while True:
+                    reviews_batch = pages_queue.get()
+                    try:
+                        if reviews_batch is None:
+                            break
+                        if filter_by_date:
+                            # Уже собранные отзывы отсекаются по ID, для остальных сравнивается только дата
+                            known_count = 0
+                            new_reviews = []
+                            for review in reviews_batch:
+                                if review.get("review_id") in last_review_ids:
+                                    known_count += 1
+                                elif self._is_newer_review(review, last_date):
+                                    new_reviews.append(review)
+                            # Страница без новых отзывов, но с уже сохраненными: дальше идут только старые
+                            if not new_reviews and known_count:
+                                caught_up.set()
+                            reviews_batch = new_reviews
+                        processed_reviews.extend(reviews_batch)
+                    except Exception as e:
+                        # Поток продолжает разбирать очередь, иначе основной поток зависнет на put и join
+                        log_error(f"Ошибка при обработке страницы отзывов: {e}", exc_info=True)
+                    finally:
+                        pages_queue.task_done()
+            
+            consumer = threading.Thread(target=process_pages, daemon=True)
+            consumer.start()
+            
+            try:
+                while not stop_parsing:
+                    log_info(f"Обработка страницы отзывов #{page_num}")
+                    
+                    # Собираем отзывы с текущей страницы
+                    page_reviews = self._collect_reviews_from_page(page, product_id, product_url)
+                    
+                    log_info(f"Собрано {len(page_reviews)} отзывов на странице #{page_num}")
+                    
+                    if not page_reviews:
+                        log_info("На этой странице не найдено отзывов, завершаем парсинг")
+                        break
+                    
+                    # Номер за последней страницей Озон может открыть с уже собранными отзывами
+                    page_review_ids = {review.get("review_id") for review in page_reviews}
+                    if page_review_ids <= seen_review_ids:
+                        log_info("На странице только уже собранные отзывы, завершаем парсинг")
+                        break
+                    seen_review_ids |= page_review_ids
+                    
+                    # Передаем отзывы страницы на обработку
+                    pages_queue.put(page_reviews)
+                    raw_count += len(page_reviews)
+                    
+                    # В инкрементном режиме решение об остановке зависит от результата фильтрации,
+                    # поэтому дожидаемся обработки страницы, чтобы не перейти на лишнюю страницу
+                    # и не превысить лимит. При полном парсинге обработка идет параллельно с загрузкой
+                    if filter_by_date:
+                        pages_queue.join()
+                        
+                        # Останавливаемся, как только дошли до собранных ранее отзывов
+                        if caught_up.is_set():
+                            log_info("Достигнуты уже собранные ранее отзывы, завершаем парсинг")
+                            break
+                    
+                    # Проверяем ограничение по количеству: в инкрементном режиме считаем только новые отзывы
+                    collected_count = len(processed_reviews) if filter_by_date else raw_count
+                    if max_reviews and collected_count >= max_reviews:
+                        log_info(f"Достигнут лимит в {max_reviews} отзывов")
+                        break
+                    
+                    # Попробуем перейти на следующую страницу
+                    if not self._navigate_to_next_reviews_page(page):
+                        log_info("Больше нет страниц с отзывами")
+                        break
+                    
+                    # Увеличиваем номер страницы и делаем паузу перед обработкой следующей
+                    page_num += 1
+                    log_info(f"Переход к обработке страницы отзывов #{page_num}")
+                    time.sleep(page_delays[(page_num - 2) % PAGE_DELAY_SCHEDULE_SIZE])
+            finally:
+                # Сигнал завершения для потока обработки
+                pages_queue.put(None)
+                consumer.join()
+            
+            log_info(f"Всего собрано {raw_count} отзывов со всех страниц (до фильтрации)")
+            
+            if filter_by_date:
+                log_info(f"После фильтрации по дате осталось {len(processed_reviews)} новых отзывов из {raw_count}")
+            all_reviews = processed_reviews
                 
         except Exception as e:
             log_error(f"Ошибка при парсинге отзывов: {e}", exc_info=True)
             # Делаем скриншот только в режиме отладки
             if self.debug_mode:
-                page.screenshot(path=f"debug_parsing_error_{datetime.now().strftime('%Y%m%d%H%M%S')}.png")
+                self._save_screenshot(page, f"debug_parsing_error_{_ts()}.jpg")
                 
         finally:
-            # Закрываем страницу
-            page.close()
+            # Закрываем свою страницу и контекст товара, браузер остается открытым
+            if own_page:
+                page.close()
+                self._close_context()
         
         # Сохраняем собранные отзывы
         if all_reviews:
@@ -1785,42 +1794,128 @@ class OzonReviewParser:
         
         return all_reviews
     
-    def parse_multiple_products(self, product_urls):
+    def parse_multiple_products(self, product_urls, concurrency=1):
         """
         Парсинг отзывов для нескольких продуктов
         
         Args:
             product_urls (list): Список URL продуктов
+            concurrency (int, optional): Количество товаров, обрабатываемых одновременно
+                (по умолчанию 1 - последовательно). Больше 1 - параллельно через parse_many
             
         Returns:
             dict: Результаты парсинга (URL -> количество отзывов)
         """
+        # Параллельная обработка: каждый поток parse_many работает со своим браузером
+        if concurrency > 1 and len(product_urls) > 1:
+            return type(self).parse_many(product_urls, max_concurrency=concurrency, debug_mode=self.debug_mode)
+        
         results = {}
         
-        for url in product_urls:
-            try:
-                reviews = self.parse_product_reviews(url)
-                results[url] = len(reviews)
-                
-                # Добавляем случайную задержку между запросами
-                time.sleep(get_random_delay() * 2)
-            except Exception as e:
-                log_error(f"Ошибка при парсинге отзывов для {url}: {e}", exc_info=True)
-                results[url] = 0
+        # Заранее рассчитываем случайные задержки между товарами
+        product_delays = [get_random_delay() * 2 for _ in product_urls]
+        
+        # Один контекст и одна страница на весь список: между товарами только переход по URL
+        if not self._ensure_browser() or not self._new_context():
+            log_error("Не удалось подготовить браузер для парсинга")
+            return {url: 0 for url in product_urls}
+        page = self.context.new_page()
+        
+        try:
+            for url, delay in zip(product_urls, product_delays):
+                try:
+                    reviews = self.parse_product_reviews(url, page=page)
+                    results[url] = len(reviews)
+                    
+                    # Добавляем случайную задержку между запросами
+                    time.sleep(delay)
+                except Exception as e:
+                    log_error(f"Ошибка при парсинге отзывов для {url}: {e}", exc_info=True)
+                    results[url] = 0
+        finally:
+            page.close()
+            self._close_context()
         
         return results
     
+    @classmethod
+    def parse_many(cls, product_urls, max_concurrency=MAX_CONCURRENT_PRODUCTS, debug_mode=False):
+        """
+        Параллельный парсинг отзывов для нескольких продуктов.
+        
+        Синхронный API Playwright нельзя использовать из разных потоков,
+        поэтому каждый рабочий поток создает собственный парсер (свой браузер)
+        и обрабатывает товары из общей очереди в отдельных контекстах.
+        
+        Args:
+            product_urls (list): Список URL продуктов
+            max_concurrency (int): Максимальное количество одновременно обрабатываемых товаров
+            debug_mode (bool): Режим отладки с сохранением скриншотов
+            
+        Returns:
+            dict: Результаты парсинга (URL -> количество отзывов)
+        """
+        url_queue = queue.Queue()
+        for url in product_urls:
+            url_queue.put(url)
+        
+        results = {}
+        
+        def worker(worker_num):
+            # Сдвигаем старт потоков, чтобы запросы не уходили одновременно
+            time.sleep(worker_num * 0.1)
+            
+            with cls(debug_mode=debug_mode) as parser:
+                while True:
+                    try:
+                        url = url_queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    
+                    try:
+                        results[url] = len(parser.parse_product_reviews(url))
+                    except Exception as e:
+                        log_error(f"Ошибка при парсинге отзывов для {url}: {e}", exc_info=True)
+                        results[url] = 0
+                    
+                    # Случайная задержка между товарами в рамках одного потока
+                    time.sleep(get_random_delay())
+        
+        workers_count = max(1, min(max_concurrency, len(product_urls)))
+        log_info(f"Параллельный парсинг {len(product_urls)} товаров в {workers_count} потоках")
+        
+        threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(workers_count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        return {url: results.get(url, 0) for url in product_urls}
+    
     def close(self):
-        """Закрытие хранилища данных"""
-        self.db.close() 
+        """Закрытие браузера и хранилища данных"""
+        self._close_browser()
+        
+        # Сохраняем подобранные селекторы отзывов для следующих запусков
+        if self._learned_selector_updates:
+            _save_learned_selectors(self._learned_selector_updates)
+            self._learned_selector_updates = {}
+        
+        # Дожидаемся записи оставшихся скриншотов
+        if self._screenshot_executor is not None:
+            self._screenshot_executor.shutdown(wait=True)
+            self._screenshot_executor = None
+        
+        self.db.close()
 
-    def _try_direct_url_navigation(self, page, current_url):
+    def _try_direct_url_navigation(self, page, current_url, current_page_num=None):
         """
         Пробует перейти на следующую страницу через прямую навигацию по URL
         
         Args:
             page: Объект страницы Playwright
             current_url: Текущий URL страницы
+            current_page_num (int, optional): Номер текущей страницы отзывов
             
         Returns:
             bool: True, если переход выполнен успешно, иначе False
@@ -1828,65 +1923,111 @@ class OzonReviewParser:
         log_info("Попытка перехода на следующую страницу через прямую навигацию по URL")
         
         try:
-            # Если есть ?page=X в URL, заменяем X на X+1
-            if "page=" in current_url:
-                match = re.search(r'page=(\d+)', current_url)
-                if match:
-                    current_page = int(match.group(1))
-                    next_page = current_page + 1
-                    log_info(f"Текущая страница: {current_page}, переход на страницу {next_page}")
-                    
-                    next_url = re.sub(r'page=\d+', f'page={next_page}', current_url)
-                    log_info(f"Переход по прямому URL: {next_url}")
-                    
-                    try:
-                        page.goto(next_url, wait_until="domcontentloaded")
-                        page.wait_for_load_state("networkidle", timeout=15000)
-                        
-                        # Проверяем, изменился ли URL после перехода
-                        if page.url != current_url:
-                            log_info(f"Успешный переход по прямому URL на страницу {next_page}")
-                            
-                            # Имитируем поведение человека
-                            self._human_like_scroll(page)
-                            self._human_like_move(page)
-                            
-                            time.sleep(random.uniform(1.0, 2.0))
-                            return True
-                        else:
-                            log_warning("URL не изменился после перехода, возможно, страница не существует")
-                    except Exception as e:
-                        log_error(f"Ошибка при переходе по прямому URL: {e}")
+            if current_page_num is None:
+                current_page_num = self._reviews_page_num
+            next_page = current_page_num + 1
+            
+            # Адрес отзывов известен после открытия товара: достаточно добавить номер страницы
+            if self._reviews_base_url:
+                next_url = f"{self._reviews_base_url}?page={next_page}"
             else:
-                # Если это первая страница, добавляем page=2
-                next_url = None
-                if "?" in current_url:
-                    next_url = f"{current_url}&page=2"
-                else:
-                    next_url = f"{current_url}?page=2"
+                next_url = _with_page_param(current_url, next_page)
+            
+            log_info(f"Текущая страница: {current_page_num}, переход по прямому URL: {next_url}")
+            
+            page.goto(next_url, wait_until="domcontentloaded")
+            # Ждем появления блока отзывов вместо networkidle
+            if not self._wait_for_reviews_ready(page):
+                log_warning("Блок отзывов не появился после перехода по прямому URL")
+            
+            # Проверяем, изменился ли URL после перехода
+            if page.url != current_url:
+                log_info(f"Успешный переход по прямому URL на страницу {next_page}")
+                self._reviews_page_num = next_page
                 
-                log_info(f"Переход по прямому URL на вторую страницу: {next_url}")
+                # Имитируем поведение человека (не на каждом переходе)
+                if self._should_imitate_human():
+                    self._human_like_scroll(page)
+                    self._human_like_move(page)
                 
-                try:
-                    page.goto(next_url, wait_until="domcontentloaded")
-                    page.wait_for_load_state("networkidle", timeout=15000)
-                    
-                    # Проверяем, изменился ли URL после перехода
-                    if page.url != current_url:
-                        log_info("Успешный переход на вторую страницу по прямому URL")
-                        
-                        # Имитируем поведение человека
-                        self._human_like_scroll(page)
-                        self._human_like_move(page)
-                        
-                        time.sleep(random.uniform(1.0, 2.0))
-                        return True
-                    else:
-                        log_warning("URL не изменился после перехода, возможно, страница не существует")
-                except Exception as e:
-                    log_error(f"Ошибка при переходе по прямому URL: {e}")
-        
+                self._settle(page)
+                return True
+            
+            log_warning("URL не изменился после перехода, возможно, страница не существует")
         except Exception as e:
-            log_error(f"Ошибка при попытке прямой навигации: {e}")
+            log_error(f"Ошибка при переходе по прямому URL: {e}")
         
-        return False
\ No newline at end of file
+        return False
+
+
+def _init_process_worker(storage_lock):
+    """Инициализация процесса-обработчика: общая для всех процессов блокировка хранилища и запись логов"""
+    use_storage_lock(storage_lock)
+    init_worker_logging()
+
+def _parse_urls_shard(urls, debug_mode=False, start_delay=0):
+    """
+    Парсит группу URL одним парсером, чтобы браузер запускался один раз на процесс
+    
+    Args:
+        urls (list): Список URL продуктов
+        debug_mode (bool): Режим отладки с сохранением скриншотов
+        start_delay (float): Задержка перед первым запросом в секундах
+        
+    Returns:
+        dict: Результаты парсинга (URL -> количество отзывов)
+    """
+    # Сдвигаем старт процессов, чтобы запросы к Озону не уходили одновременно
+    time.sleep(start_delay)
+    
+    # Внутри процесса товары идут последовательно: параллельность уже дают сами процессы
+    with OzonReviewParser(debug_mode=debug_mode) as parser:
+        return parser.parse_multiple_products(urls, concurrency=1)
+
+def parse_url(url, debug_mode=False):
+    """
+    Парсит отзывы одного товара в отдельном экземпляре парсера
+    
+    Args:
+        url (str): URL продукта
+        debug_mode (bool): Режим отладки с сохранением скриншотов
+        
+    Returns:
+        dict: Результаты парсинга (URL -> количество отзывов)
+    """
+    return _parse_urls_shard([url], debug_mode=debug_mode)
+
+def parse_urls(urls, workers=4, debug_mode=False):
+    """
+    Парсит отзывы нескольких товаров в отдельных процессах.
+    
+    Синхронный Playwright не потокобезопасен, а процессы полностью независимы:
+    каждый процесс получает свою часть URL и обрабатывает ее одним браузером.
+    
+    Args:
+        urls (list): Список URL продуктов
+        workers (int): Количество процессов
+        debug_mode (bool): Режим отладки с сохранением скриншотов
+        
+    Returns:
+        dict: Результаты парсинга (URL -> количество отзывов)
+    """
+    # Без URL не запускаем ни процессы, ни браузеры
+    if not urls:
+        return {}
+    
+    workers = max(1, min(workers, len(urls)))
+    shards = [urls[i::workers] for i in range(workers)]
+    log_info(f"Параллельный парсинг {len(urls)} товаров в {workers} процессах")
+    
+    results = {}
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_process_worker,
+        initargs=(multiprocessing.RLock(),)
+    ) as executor:
+        start_delays = [worker_num * 0.1 for worker_num in range(workers)]
+        for shard_results in executor.map(_parse_urls_shard, shards, [debug_mode] * workers, start_delays):
+            results.update(shard_results)
+    
+    return {url: results.get(url, 0) for url in urls}
@@ -0,0 +1,62 @@
+import atexit
+from functools import lru_cache
+from playwright.sync_api import sync_playwright
+from src.utils.logger import log_info, log_debug
+
+# Аргументы запуска Chromium, общие для тестовых скриптов
+BROWSER_ARGS = (
+    '--disable-blink-features=AutomationControlled',
+    '--disable-features=IsolateOrigins,site-per-process',
+    '--disable-site-isolation-trials',
+    '--disable-web-security',
+    '--disable-features=BlockInsecurePrivateNetworkRequests'
+)
+
+
+@lru_cache(maxsize=1)
+def get_playwright():
+    """
+    Запускает Playwright один раз на процесс
+    
+    Returns:
+        Playwright: Запущенный экземпляр Playwright
+    """
+    return sync_playwright().start()
+
+
+@lru_cache(maxsize=1)
+def get_browser(headless=False):
+    """
+    Возвращает общий браузер, запущенный один раз на процесс.
+    Тесты создают и закрывают только свои контексты, сам браузер
+    закрывается при завершении процесса.
+    
+    Args:
+        headless (bool): Запускать ли браузер в фоновом режиме
+    
+    Returns:
+        Browser: Запущенный браузер Chromium
+    """
+    playwright = get_playwright()
+    log_info("Запуск общего браузера для тестов")
+    browser = playwright.chromium.launch(headless=headless, args=list(BROWSER_ARGS))
+    atexit.register(_shutdown, browser, playwright)
+    return browser
+
+
+def _shutdown(browser, playwright):
+    """
+    Закрывает общий браузер и останавливает Playwright
+    
+    Args:
+        browser (Browser): Общий браузер
+        playwright (Playwright): Экземпляр Playwright
+    """
+    try:
+        browser.close()
+    except Exception as e:
+        log_debug(f"Ошибка при закрытии общего браузера: {e}")
+    try:
+        playwright.stop()
+    except Exception as e:
+        log_debug(f"Ошибка при остановке Playwright: {e}")
@@ -23,18 +23,33 @@ else:
 HEADLESS = os.getenv("HEADLESS", "true").lower() == "true"  # По умолчанию headless=true для production
 USER_AGENT = os.getenv("USER_AGENT", "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
 REQUEST_TIMEOUT = int(os.getenv("REQUEST_TIMEOUT", "30000"))
+NAV_TIMEOUT = int(os.getenv("NAV_TIMEOUT", "15000"))  # Тайм-аут переходов и ожидания загрузки страниц (мс)
+# Тайм-аут кликов и ожидания элементов (мс). Повторных попыток для этих ожиданий нет,
+# поэтому по умолчанию он равен REQUEST_TIMEOUT: медленно загружаемый блок отзывов не должен отваливаться
+ACTION_TIMEOUT = int(os.getenv("ACTION_TIMEOUT", str(REQUEST_TIMEOUT)))
 DEFAULT_DELAY = int(os.getenv("DEFAULT_DELAY", "300"))
 MAX_RETRIES = int(os.getenv("MAX_RETRIES", "3"))
 
 # Лимиты и интервалы
 MAX_REVIEWS_PER_PRODUCT = int(os.getenv("MAX_REVIEWS_PER_PRODUCT", "5000"))
+MAX_CONCURRENT_PRODUCTS = int(os.getenv("MAX_CONCURRENT_PRODUCTS", "1"))
 MIN_DELAY = int(os.getenv("MIN_DELAY_BETWEEN_REQUESTS", "2000"))
 MAX_DELAY = int(os.getenv("MAX_DELAY_BETWEEN_REQUESTS", "5000"))
 
 # Настройки инкрементного парсинга
 INCREMENTAL_PARSING = os.getenv("INCREMENTAL_PARSING", "true").lower() == "true"
 REVIEW_STORAGE_PATH = os.getenv("REVIEW_STORAGE_PATH", "data/reviews")
+# Файл с селекторами отзывов, подобранными для сайтов на прошлых запусках
+LEARNED_SELECTORS_PATH = os.getenv("LEARNED_SELECTORS_PATH", "data/learned_selectors.json")
+
+# Границы задержки в секундах, пересчитываются один раз при загрузке модуля
+_MIN_DELAY_S = MIN_DELAY / 1000.0
+_MAX_DELAY_S = MAX_DELAY / 1000.0
 
 def get_random_delay():
-    """Возвращает случайную задержку между MIN_DELAY и MAX_DELAY"""
-    return random.randint(MIN_DELAY, MAX_DELAY) / 1000.0 
\ No newline at end of file
+    """Возвращает случайную задержку между MIN_DELAY и MAX_DELAY (в секундах)"""
+    return random.uniform(_MIN_DELAY_S, _MAX_DELAY_S)
+
+def get_delay_schedule(count, min_delay=1.0, max_delay=2.0):
+    """Возвращает заранее рассчитанный список из count случайных задержек (в секундах)"""
+    return [random.uniform(min_delay, max_delay) for _ in range(count)] 
\ No newline at end of file
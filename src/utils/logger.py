@@ -1,5 +1,9 @@
+import atexit
 import logging
+import logging.handlers
+import multiprocessing.util
 import os
+import queue
 from datetime import datetime
 
 # Создаем директорию для логов, если она не существует
@@ -9,34 +13,86 @@ os.makedirs("logs", exist_ok=True)
 log_format = "%(asctime)s - %(levelname)s - %(message)s"
 date_format = "%Y-%m-%d %H:%M:%S"
 
-# Настраиваем логгер
+# Настраиваем логгер: потоки парсера только кладут записи в очередь, а форматирование
+# и запись в файл и консоль выполняет фоновый поток QueueListener
+_formatter = logging.Formatter(log_format, datefmt=date_format)
+_file_handler = logging.FileHandler(f"logs/parser_{datetime.now().strftime('%Y%m%d')}.log")
+_stream_handler = logging.StreamHandler()
+for _handler in (_file_handler, _stream_handler):
+    _handler.setFormatter(_formatter)
+
+_log_queue = queue.Queue(-1)
+_listener = logging.handlers.QueueListener(_log_queue, _file_handler, _stream_handler)
+_listener.start()
+
+# QueueHandler подставляет аргументы в сообщение, а формат с датой и уровнем применяют обработчики слушателя
+_queue_handler = logging.handlers.QueueHandler(_log_queue)
+_queue_handler.setFormatter(logging.Formatter("%(message)s"))
+
+
+def _stop_listener():
+    """Дописывает оставшиеся в очереди записи и останавливает поток слушателя текущего процесса"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def _restart_listener_after_fork():
+    """
+    Запускает слушатель заново в дочернем процессе после fork.
+    
+    Очередь копируется в дочерний процесс, а поток слушателя нет, поэтому без
+    перезапуска записи процессов-обработчиков оставались бы в очереди и терялись
+    """
+    global _log_queue, _listener
+    _log_queue = queue.Queue(-1)
+    _queue_handler.queue = _log_queue
+    _listener = logging.handlers.QueueListener(_log_queue, _file_handler, _stream_handler)
+    _listener.start()
+
+
+# При выходе дописываем оставшиеся в очереди записи
+atexit.register(_stop_listener)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_listener_after_fork)
+
+
+def init_worker_logging():
+    """
+    Настраивает логирование в процессе-обработчике пула.
+    
+    Процессы multiprocessing завершаются через os._exit без вызова atexit,
+    поэтому остановка слушателя регистрируется финализатором multiprocessing,
+    который выполняется при выходе процесса (и при fork, и при spawn)
+    """
+    multiprocessing.util.Finalize(None, _stop_listener, exitpriority=0)
+
 logging.basicConfig(
     level=logging.INFO,
-    format=log_format,
-    datefmt=date_format,
-    handlers=[
-        logging.FileHandler(f"logs/parser_{datetime.now().strftime('%Y%m%d')}.log"),
-        logging.StreamHandler()
-    ]
+    handlers=[_queue_handler]
 )
 
 logger = logging.getLogger("ozon_parser")
 
-def log_info(message):
+# Аргументы сообщений подставляются лениво (logger.info("Отзыв %s", review_id)):
+# строка не форматируется, если уровень логирования отключен
+
+def log_info(message, *args):
     """Логирование информационного сообщения"""
-    logger.info(message)
+    logger.info(message, *args)
 
-def log_error(message, exc_info=None):
+def log_error(message, *args, exc_info=None):
     """Логирование ошибки"""
     if exc_info:
-        logger.error(message, exc_info=exc_info)
+        logger.error(message, *args, exc_info=exc_info)
     else:
-        logger.error(message)
+        logger.error(message, *args)
 
-def log_warning(message):
+def log_warning(message, *args):
     """Логирование предупреждения"""
-    logger.warning(message)
+    logger.warning(message, *args)
 
-def log_debug(message):
+def log_debug(message, *args):
     """Логирование отладочного сообщения"""
-    logger.debug(message) 
\ No newline at end of file
+    logger.debug(message, *args)
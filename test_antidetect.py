@@ -3,36 +3,115 @@
 Тестовый скрипт для проверки возможности обхода защиты от ботов на сайте Ozon.
 """
 
+import os
+from contextlib import ExitStack
 import time
 import random
-from playwright.sync_api import sync_playwright
+from pathlib import Path
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+from src.utils.browser_pool import get_browser
 from src.utils.logger import log_info, log_error, log_warning
 
+# Скрипт обхода обнаружения автоматизации, общий с парсерами; читается один раз при импорте
+_STEALTH_JS = (Path(__file__).parent / "src/parsers/_stealth.js").read_text(encoding="utf-8")
+
+# Прокрутка целиком выполняется в браузере: паузы между шагами берутся на таймерах
+# страницы с логнормальным распределением, без обращений из Python на каждом шаге
+_SCROLL_SIMULATION_JS = """async ({steps, minAmount, maxAmount}) => {
+    const lognormal = (mu, sigma) => {
+        const u = 1 - Math.random();
+        const v = Math.random();
+        return Math.exp(mu + sigma * Math.sqrt(-2 * Math.log(u)) * Math.cos(2 * Math.PI * v));
+    };
+    for (let i = 0; i < steps; i++) {
+        window.scrollBy(0, minAmount + Math.floor(Math.random() * (maxAmount - minAmount + 1)));
+        const delay = Math.min(Math.max(lognormal(0.35, 0.3), 1.0), 2.5) * 1000;
+        await new Promise(resolve => setTimeout(resolve, delay));
+    }
+}"""
+
+# Запускает прокрутку и сразу возвращает управление; окончание отмечается флагом в window
+_START_SCROLL_SIMULATION_JS = f"""(params) => {{
+    window.__scrollSimulationDone = false;
+    ({_SCROLL_SIMULATION_JS})(params).finally(() => {{ window.__scrollSimulationDone = true; }});
+}}"""
+
+# Скриншоты сохраняются только при TEST_DEBUG=1
+DEBUG = os.getenv("TEST_DEBUG", "0") == "1"
+
+# Профиль браузера для теста обхода защиты; вынесен на уровень модуля для переиспользования
+TEST_USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36"
+TEST_VIEWPORT = {"width": 1920, "height": 1080}
+TEST_EXTRA_HEADERS = {
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
+    "Accept-Language": "ru-RU,ru;q=0.8,en-US;q=0.5,en;q=0.3",
+    "Accept-Encoding": "gzip, deflate, br",
+    "DNT": "1",
+    "Connection": "keep-alive",
+    "Upgrade-Insecure-Requests": "1",
+    "Sec-Fetch-Dest": "document",
+    "Sec-Fetch-Mode": "navigate",
+    "Sec-Fetch-Site": "none",
+    "Sec-Fetch-User": "?1",
+    "Pragma": "no-cache",
+    "Cache-Control": "no-cache"
+}
+
 # URL для тестирования
 TEST_URL = "https://www.ozon.ru/product/prezervativy-unilatex-ultrathin-12-sht-3-sht-v-podarok-210502516/?at=oZt6m0QvBhmjVk9ohkOlgQJC8NxOZVsDEGXjRi90w9pW&"
 
+def _bezier_path(start, end, ctrl, n=50):
+    """
+    Возвращает точки квадратичной кривой Безье от start до end
+    
+    Args:
+        start (tuple): Начальная точка (x, y)
+        end (tuple): Конечная точка (x, y)
+        ctrl (tuple): Контрольная точка (x, y)
+        n (int): Количество точек на кривой
+        
+    Returns:
+        list: Список точек (x, y)
+    """
+    points = []
+    for i in range(1, n + 1):
+        t = i / n
+        a, b, c = (1 - t) ** 2, 2 * (1 - t) * t, t * t
+        points.append((
+            a * start[0] + b * ctrl[0] + c * end[0],
+            a * start[1] + b * ctrl[1] + c * end[1]
+        ))
+    return points
+
+def _save_screenshot(page, path, description):
+    """
+    Делает скриншот видимой области в JPEG, если включен режим отладки
+    
+    Args:
+        page: Объект страницы Playwright
+        path (str): Путь к файлу скриншота
+        description (str): Описание скриншота для лога
+    """
+    if not DEBUG:
+        return
+    page.screenshot(path=path, type="jpeg", quality=70)
+    log_info(f"Сделан скриншот {description} ({path})")
+
 def run_test():
     """Запускает тест обхода защиты от ботов"""
     log_info("Запуск теста обхода защиты от ботов")
     
-    with sync_playwright() as playwright:
+    # Ресурсы теста регистрируются в ExitStack по мере создания и закрываются
+    # в обратном порядке при любом выходе; общий браузер остается запущенным
+    with ExitStack() as stack:
         try:
-            # Запускаем браузер с расширенными настройками
-            browser = playwright.chromium.launch(
-                headless=False,
-                args=[
-                    '--disable-blink-features=AutomationControlled',
-                    '--disable-features=IsolateOrigins,site-per-process',
-                    '--disable-site-isolation-trials',
-                    '--disable-web-security',
-                    '--disable-features=BlockInsecurePrivateNetworkRequests'
-                ]
-            )
+            # Берем общий браузер, запущенный один раз на процесс
+            browser = get_browser()
             
             # Настраиваем контекст с реалистичными параметрами
             context = browser.new_context(
-                user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36",
-                viewport={"width": 1920, "height": 1080},
+                user_agent=TEST_USER_AGENT,
+                viewport=TEST_VIEWPORT,
                 device_scale_factor=1.5,
                 locale="ru-RU",
                 timezone_id="Europe/Moscow",
@@ -42,78 +121,35 @@ def run_test():
                 has_touch=False,
                 is_mobile=False,
                 permissions=["geolocation", "notifications"],
-                extra_http_headers={
-                    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
-                    "Accept-Language": "ru-RU,ru;q=0.8,en-US;q=0.5,en;q=0.3",
-                    "Accept-Encoding": "gzip, deflate, br",
-                    "DNT": "1",
-                    "Connection": "keep-alive",
-                    "Upgrade-Insecure-Requests": "1",
-                    "Sec-Fetch-Dest": "document",
-                    "Sec-Fetch-Mode": "navigate",
-                    "Sec-Fetch-Site": "none",
-                    "Sec-Fetch-User": "?1",
-                    "Pragma": "no-cache",
-                    "Cache-Control": "no-cache"
-                }
+                extra_http_headers=TEST_EXTRA_HEADERS
             )
+            stack.callback(context.close)
             
-            # Добавляем скрипты для обхода обнаружения автоматизации
+            # Подключаем скрипт обхода обнаружения автоматизации ко всему контексту
+            context.add_init_script(_STEALTH_JS)
             page = context.new_page()
-            page.add_init_script("""
-                Object.defineProperty(navigator, 'webdriver', {
-                    get: () => false
-                });
-                
-                Object.defineProperty(navigator, 'plugins', {
-                    get: () => [
-                        {
-                            0: {type: "application/x-google-chrome-pdf", suffixes: "pdf", description: "Portable Document Format"},
-                            description: "Portable Document Format",
-                            filename: "internal-pdf-viewer",
-                            name: "Chrome PDF Plugin",
-                            length: 1
-                        },
-                        {
-                            0: {type: "application/pdf", suffixes: "pdf", description: "Portable Document Format"},
-                            description: "Portable Document Format",
-                            filename: "mhjfbmdgcfjbbpaeojofohoefgiehjai",
-                            name: "Chrome PDF Viewer",
-                            length: 1
-                        },
-                        {
-                            0: {type: "application/x-nacl", suffixes: "", description: "Native Client Executable"},
-                            1: {type: "application/x-pnacl", suffixes: "", description: "Portable Native Client Executable"},
-                            description: "Native Client",
-                            filename: "internal-nacl-plugin",
-                            name: "Native Client",
-                            length: 2
-                        }
-                    ]
-                });
-                
-                const originalQuery = window.navigator.permissions.query;
-                window.navigator.permissions.query = (parameters) => (
-                    parameters.name === 'notifications' ?
-                        Promise.resolve({state: Notification.permission}) :
-                        originalQuery(parameters)
-                );
-            """)
+            stack.callback(page.close)
             
             # Переходим на тестовую страницу
             log_info(f"Переход на страницу: {TEST_URL}")
             page.goto(TEST_URL, wait_until="domcontentloaded")
             
-            # Добавляем случайную задержку
-            time.sleep(random.uniform(3.0, 5.0))
+            # Ждем заголовок товара или сообщение об ограничении вместо фиксированной паузы
+            try:
+                page.wait_for_selector("h1, :text('Доступ ограничен')", timeout=8000)
+            except Exception as e:
+                log_warning(f"Ни заголовок, ни сообщение об ограничении не появились за 8 сек: {e}")
+            
+            # Небольшая случайная задержка для вариативности таймингов
+            time.sleep(random.uniform(0.2, 0.6))
             
-            # Проверяем, есть ли ограничение доступа
-            if page.get_by_text("Доступ ограничен").is_visible():
+            # Проверяем, есть ли ограничение доступа; локатор переиспользуется для повторной проверки
+            restricted = page.get_by_text("Доступ ограничен")
+            if restricted.is_visible():
                 log_warning("Обнаружено ограничение доступа, пытаемся его обойти")
                 
                 # Делаем скриншот страницы с ограничением
-                page.screenshot(path="access_restricted.png")
-                log_info("Сделан скриншот страницы с ограничением (access_restricted.png)")
+                _save_screenshot(page, "access_restricted.jpg", "страницы с ограничением")
                 
                 # Нажимаем кнопку "Обновить"
                 refresh_button = page.get_by_role("button", name="Обновить")
@@ -121,41 +157,52 @@ def run_test():
                     log_info("Нажимаем кнопку 'Обновить'")
                     refresh_button.click()
                     
-                    # Ждем загрузки страницы
-                    page.wait_for_load_state("networkidle")
-                    time.sleep(random.uniform(3.0, 5.0))
-                    
-                    # Проверяем, решилась ли проблема
-                    if not page.get_by_text("Доступ ограничен").is_visible():
+                    # Ждем, пока сообщение об ограничении исчезнет (networkidle на Ozon может не наступить)
+                    try:
+                        restricted.wait_for(state="hidden", timeout=10000)
+                        time.sleep(random.uniform(0.2, 0.6))
                         log_info("Удалось преодолеть ограничение доступа!")
-                        page.screenshot(path="access_granted.png")
-                        log_info("Сделан скриншот после преодоления ограничения (access_granted.png)")
-                    else:
+                        _save_screenshot(page, "access_granted.jpg", "после преодоления ограничения")
+                    except PlaywrightTimeoutError:
                         log_error("Не удалось преодолеть ограничение доступа")
-                        page.screenshot(path="access_still_restricted.png")
-                        log_info("Сделан скриншот страницы с сохраняющимся ограничением (access_still_restricted.png)")
+                        _save_screenshot(page, "access_still_restricted.jpg", "страницы с сохраняющимся ограничением")
             else:
                 log_info("Доступ к странице получен успешно!")
-                page.screenshot(path="access_success.png")
-                log_info("Сделан скриншот успешного доступа (access_success.png)")
+                _save_screenshot(page, "access_success.jpg", "успешного доступа")
+            
+            # Запускаем прокрутку в браузере без ожидания: она идет на таймерах страницы
+            # одновременно с движениями мыши из Python
+            log_info("Имитация прокрутки страницы и движений мыши...")
+            page.evaluate(_START_SCROLL_SIMULATION_JS, {"steps": 3, "minAmount": 300, "maxAmount": 800})
             
-            # Имитируем движения мыши
-            log_info("Имитация движений мыши...")
             viewport_size = page.viewport_size
             width, height = viewport_size["width"], viewport_size["height"]
             
-            for _ in range(5):
-                x = random.randint(100, width - 100)
-                y = random.randint(100, height - 300)
-                page.mouse.move(x, y, steps=random.randint(5, 10))
-                time.sleep(random.uniform(0.3, 1.0))
+            # Вся траектория строится заранее: кривые Безье между случайными точками
+            # с логнормальными паузами вместо прямых отрезков с равномерными задержками
+            waypoints = [(width / 2, height / 2)] + [
+                (random.randint(100, width - 100), random.randint(100, height - 300))
+                for _ in range(5)
+            ]
+            trajectory = []
+            for start, end in zip(waypoints, waypoints[1:]):
+                ctrl = (random.uniform(100, width - 100), random.uniform(100, height - 300))
+                trajectory.extend(
+                    (x, y, random.lognormvariate(-4.5, 0.3))
+                    for x, y in _bezier_path(start, end, ctrl, n=10)
+                )
+                # Пауза в конце отрезка, как у человека, остановившего курсор
+                trajectory[-1] = (*trajectory[-1][:2], min(max(random.lognormvariate(-0.5, 0.4), 0.2), 1.5))
             
-            # Имитируем прокрутку страницы
-            log_info("Имитация прокрутки страницы...")
-            for _ in range(3):
-                scroll_amount = random.randint(300, 800)
-                page.evaluate(f"window.scrollBy(0, {scroll_amount})")
-                time.sleep(random.uniform(1.0, 2.0))
+            for x, y, delay in trajectory:
+                page.mouse.move(x, y)
+                time.sleep(delay)
+            
+            # Дожидаемся окончания прокрутки, если она еще идет
+            try:
+                page.wait_for_function("() => window.__scrollSimulationDone === true", timeout=15000)
+            except PlaywrightTimeoutError:
+                log_warning("Имитация прокрутки не завершилась за 15 сек")
             
             # Проверяем загрузку контента
             log_info("Проверка загрузки контента...")
@@ -166,27 +213,25 @@ def run_test():
                     log_info(f"Заголовок товара: {product_title.inner_text()}")
                 
                 # Проверяем наличие отзывов
-                reviews_section = page.query_selector('[data-widget="webReviewList"], [data-widget="reviews"]')
+                reviews_section = page.query_selector('xpath=//*[@data-widget="webReviewList" or @data-widget="reviews"]')
                 if reviews_section:
                     log_info("Секция отзывов найдена на странице!")
                 else:
                     log_warning("Секция отзывов не найдена, возможно нужно прокрутить страницу дальше")
                 
-                page.screenshot(path="final_state.png")
-                log_info("Сделан скриншот финального состояния страницы (final_state.png)")
+                _save_screenshot(page, "final_state.jpg", "финального состояния страницы")
                 
             except Exception as e:
                 log_error(f"Ошибка при проверке контента: {e}")
             
-            # Даем пользователю время на визуальную проверку
-            log_info("Тест завершен. Браузер закроется через 10 секунд...")
-            time.sleep(10)
+            # Даем пользователю время на визуальную проверку только в интерактивном запуске
+            if os.getenv("INTERACTIVE"):
+                input("Тест завершен. Нажмите Enter, чтобы закрыть страницу...")
+            else:
+                log_info("Тест завершен")
             
         except Exception as e:
             log_error(f"Ошибка при выполнении теста: {e}")
-        finally:
-            if 'browser' in locals():
-                browser.close()
 
 if __name__ == "__main__":
     run_test() 
\ No newline at end of file
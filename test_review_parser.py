@@ -1,9 +1,10 @@
 #!/usr/bin/env python
 import os
-import time
 import logging
 import json
 import argparse
+from functools import cache
+from pathlib import Path
 from dotenv import load_dotenv
 from parsers.lube_ozon_review_parser import OzonReviewParser
 from src.utils.logger import log_info, log_error, log_warning, log_debug
@@ -11,17 +12,19 @@ from src.utils.config import (
     HEADLESS, USER_AGENT, REQUEST_TIMEOUT, DEFAULT_DELAY,
     MAX_REVIEWS_PER_PRODUCT, INCREMENTAL_PARSING
 )
-from playwright.sync_api import sync_playwright
+from src.utils.browser_pool import get_browser
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
 
-# Загрузка переменных окружения
-load_dotenv()
-
-# Настройка уровня логирования
-os.environ['LOG_LEVEL'] = 'DEBUG'
-logging.getLogger().setLevel(logging.DEBUG)
+# Стандартные CSS-селекторы, по которым test_screenshot пересчитывает элементы отзывов
+REVIEW_PROBE_SELECTORS = (
+    'div[data-review-uuid]',
+    'div.review-item',
+    'div[itemprop="review"]',
+    'div[data-widget="webReviewsList"]'
+)
 
 
-def test_review_parsing(test_url=None, max_reviews=None, incremental=None, debug_mode=True):
+def test_review_parsing(test_url=None, max_reviews=None, incremental=None, debug_mode=True, parser=None):
     """
     Тестирование парсера отзывов с подробным логированием и проверкой пагинации
     
@@ -30,6 +33,11 @@ def test_review_parsing(test_url=None, max_reviews=None, incremental=None, debug
         max_reviews (int, optional): Максимальное количество отзывов для сбора.
         incremental (bool, optional): Использовать ли инкрементный режим парсинга.
         debug_mode (bool, optional): Включить ли режим отладки с сохранением скриншотов.
+        parser (OzonReviewParser, optional): Готовый парсер. Если передан, его браузер
+            не закрывается после теста и может использоваться дальше вызывающим кодом.
+    
+    Returns:
+        bool: True, если удалось собрать хотя бы один отзыв, иначе False
     """
     # URL товара для тестирования - короткая версия как рекомендовано
     if not test_url:
@@ -38,18 +46,17 @@ def test_review_parsing(test_url=None, max_reviews=None, incremental=None, debug
     log_info("Запуск тестирования парсера отзывов")
     log_info(f"Тестовый URL: {test_url}")
     
-    # Инициализация парсера с режимом отладки
-    parser = OzonReviewParser(debug_mode=debug_mode)
+    # Инициализация парсера с режимом отладки, если готовый не передан
+    owns_parser = parser is None
+    if owns_parser:
+        parser = OzonReviewParser(debug_mode=debug_mode)
     
+    success = False
     try:
         # Установка параметров для отладки
         os.environ['HEADLESS'] = 'false' if debug_mode else 'true'
         os.environ['LOG_LEVEL'] = 'DEBUG' if debug_mode else 'INFO'
         
-        log_info("Запуск браузера...")
-        # Запуск браузера и настройка
-        parser._initialize_browser()
-        
         # Вывод используемых настроек
         log_info(f"Используемый User-Agent: {USER_AGENT}")
         log_info(f"Таймаут запросов: {REQUEST_TIMEOUT} сек.")
@@ -68,117 +75,153 @@ def test_review_parsing(test_url=None, max_reviews=None, incremental=None, debug
         # Сохранение всех собранных отзывов
         if all_reviews:
             log_info(f"Всего собрано {len(all_reviews)} отзывов")
-            with open("test_reviews.json", "w", encoding="utf-8") as f:
-                json.dump(all_reviews, f, ensure_ascii=False, indent=2)
+            # json.dumps без отступов сериализует весь список C-кодировщиком за один вызов,
+            # тогда как json.dump всегда идет через построчный Python-генератор
+            Path("test_reviews.json").write_text(
+                json.dumps(all_reviews, ensure_ascii=False, separators=(",", ":")), encoding="utf-8"
+            )
             log_info("Все отзывы сохранены в файл test_reviews.json")
+            success = True
         else:
             log_error("Не удалось собрать ни одного отзыва!")
         
     except Exception as e:
         log_error(f"Критическая ошибка при тестировании: {e}", exc_info=True)
     finally:
-        # Закрытие браузера
-        log_info("Закрытие браузера...")
-        parser.close()
+        # Закрываем браузер, только если парсер создан здесь
+        if owns_parser:
+            log_info("Закрытие браузера...")
+            parser.close()
         log_info("Тестирование завершено")
+    
+    return success
 
 
-def test_screenshot():
-    """Делает скриншот страницы с отзывами для анализа структуры"""
+def test_screenshot(browser=None, debug_mode=True):
+    """
+    Делает скриншот страницы с отзывами для анализа структуры
+    
+    Args:
+        browser (Browser, optional): Уже запущенный браузер, например браузер парсера.
+            Если не передан, используется общий браузер тестов.
+        debug_mode (bool, optional): Сохранять ли HTML страницы для анализа.
+    """
     url = "https://www.ozon.ru/product/prezervativy-unilatex-ultrathin-12-sht-3-sht-v-podarok-210502516/"
     reviews_url = f"{url}reviews/"
     
     print(f"Тестирование URL: {reviews_url}")
     
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=False)  # Запускаем в видимом режиме
-        context = browser.new_context(
-            user_agent=USER_AGENT,
-            viewport={"width": 1920, "height": 1080}
-        )
-        
+    # Браузер переиспользуется, а контекст создается свой: в контексте парсера
+    # заблокированы изображения и медиа, которые нужны на диагностическом скриншоте
+    if browser is None:
+        browser = get_browser()
+    context = browser.new_context(
+        user_agent=USER_AGENT,
+        viewport={"width": 1920, "height": 1080}
+    )
+    
+    # Контекст закрывается и при ошибке, иначе он остается открытым в общем браузере
+    try:
         page = context.new_page()
         
         # Открываем страницу
         print("Открываем страницу отзывов...")
         page.goto(reviews_url, wait_until="domcontentloaded")
-        time.sleep(5)  # Ждем загрузки
+        # Ждем отзывы или сообщение об их отсутствии вместо фиксированной паузы
+        try:
+            page.wait_for_selector(
+                'div[data-review-uuid], :text("У этого товара пока нет отзывов")', timeout=8000
+            )
+        except PlaywrightTimeoutError:
+            print("Отзывы не появились за 8 секунд, делаем скриншот как есть")
         
         # Делаем скриншот
         screenshot_path = "reviews_page_screenshot.png"
         page.screenshot(path=screenshot_path)
         print(f"Скриншот сохранен: {screenshot_path}")
         
-        # Получаем HTML структуру страницы
-        html_content = page.content()
-        with open("reviews_page_html.html", "w", encoding="utf-8") as f:
-            f.write(html_content)
-        print("HTML страницы сохранен в reviews_page_html.html")
-        
-        # Ищем элементы отзывов
-        review_elements = page.query_selector_all('div[data-review-uuid]')
-        print(f"Найдено элементов с data-review-uuid: {len(review_elements)}")
-        
-        # Пробуем другие селекторы
-        other_selectors = [
-            'div.review-item', 
-            'div[itemprop="review"]',
-            'div[data-widget="webReviewsList"]',
-            'div:has-text("отзыв")'
-        ]
-        
-        for selector in other_selectors:
-            elements = page.query_selector_all(selector)
-            print(f"Селектор {selector}: найдено {len(elements)} элементов")
-        
-        # Смотрим элементы с текстом "отзыв"
-        review_text_elements = page.evaluate("""() => {
-            const elements = Array.from(document.querySelectorAll('*'))
-                .filter(el => el.innerText && el.innerText.toLowerCase().includes('отзыв'));
-            return elements.length;
+        # HTML нужен только для анализа структуры, сериализация всего DOM делается лишь в режиме отладки
+        if debug_mode:
+            Path("reviews_page_html.html").write_text(page.content(), encoding="utf-8")
+            print("HTML страницы сохранен в reviews_page_html.html")
+        
+        # Считаем элементы по всем селекторам за один вызов evaluate
+        selector_counts = page.evaluate("""(selectors) => {
+            const counts = Object.fromEntries(selectors.map(s => [s, document.querySelectorAll(s).length]));
+            // Аналог Playwright-селектора div:has-text("отзыв"), который не поддерживается querySelectorAll
+            counts['div:has-text("отзыв")'] = Array.from(document.querySelectorAll('div'))
+                .filter(el => el.textContent.toLowerCase().includes('отзыв')).length;
+            return counts;
+        }""", list(REVIEW_PROBE_SELECTORS))
+        print(f"Найдено элементов с data-review-uuid: {selector_counts.pop('div[data-review-uuid]')}")
+        
+        for selector, count in selector_counts.items():
+            print(f"Селектор {selector}: найдено {count} элементов")
+        
+        # Смотрим текстовые узлы со словом "отзыв": textContent, в отличие от innerText, не вызывает пересчет раскладки
+        review_text_nodes = page.evaluate("""() => {
+            const walker = document.createTreeWalker(document.body, NodeFilter.SHOW_TEXT);
+            let node, count = 0;
+            while ((node = walker.nextNode())) {
+                if (node.nodeValue.toLowerCase().includes('отзыв')) count++;
+            }
+            return count;
         }""")
-        print(f"Элементов с текстом 'отзыв': {review_text_elements}")
+        print(f"Текстовых узлов со словом 'отзыв': {review_text_nodes}")
         
         # Проверяем содержимое страницы на наличие "У этого товара пока нет отзывов"
         if page.get_by_text("У этого товара пока нет отзывов").is_visible():
             print("На странице указано: У этого товара пока нет отзывов")
         
-        # Ждем чтобы увидеть страницу
-        time.sleep(10)
-        
-        browser.close()
+        # Даем посмотреть на страницу только в интерактивном запуске
+        if os.getenv("INTERACTIVE"):
+            input("Нажмите Enter, чтобы закрыть страницу...")
+    finally:
+        context.close()
+
+
+@cache
+def _get_argparser():
+    """
+    Создает парсер аргументов командной строки один раз на процесс
+    
+    Returns:
+        argparse.ArgumentParser: Парсер аргументов для тестирования
+    """
+    arg_parser = argparse.ArgumentParser(description='Тестирование парсера отзывов Ozon')
+    arg_parser.add_argument('--url', type=str, help='URL товара для тестирования')
+    arg_parser.add_argument('--max-reviews', type=int, help='Максимальное количество отзывов для сбора')
+    # Без флага режим парсинга берется из настроек (INCREMENTAL_PARSING)
+    arg_parser.add_argument('--incremental', action=argparse.BooleanOptionalAction, default=None,
+                            help='Инкрементный (--incremental) или полный (--no-incremental) режим парсинга')
+    arg_parser.add_argument('--debug', action=argparse.BooleanOptionalAction, default=True,
+                            help='Режим отладки с сохранением скриншотов (по умолчанию включен)')
+    arg_parser.add_argument('--inspect', action='store_true',
+                            help='Всегда делать диагностический скриншот страницы отзывов, даже при успешном парсинге')
+    return arg_parser
 
 
 if __name__ == "__main__":
-    # Парсинг аргументов командной строки для гибкого тестирования
-    parser = argparse.ArgumentParser(description='Тестирование парсера отзывов Ozon')
-    parser.add_argument('--url', type=str, help='URL товара для тестирования')
-    parser.add_argument('--max-reviews', type=int, help='Максимальное количество отзывов для сбора')
-    parser.add_argument('--incremental', action='store_true', help='Использовать инкрементный режим парсинга')
-    parser.add_argument('--full', action='store_true', help='Использовать полный режим парсинга')
-    parser.add_argument('--debug', action='store_true', help='Включить режим отладки с сохранением скриншотов')
-    parser.add_argument('--no-debug', action='store_true', help='Выключить режим отладки')
+    # Загрузка переменных окружения и уровень логирования настраиваются только при запуске
+    # скрипта, чтобы импорт модуля не менял глобальное состояние
+    load_dotenv()
+    os.environ['LOG_LEVEL'] = 'DEBUG'
+    logging.getLogger().setLevel(logging.DEBUG)
     
-    args = parser.parse_args()
+    args = _get_argparser().parse_args()
     
     # Определение параметров
     test_url = args.url
     max_reviews = args.max_reviews
+    incremental = args.incremental
+    debug_mode = args.debug
     
-    # Определение режима инкрементного парсинга
-    incremental = None
-    if args.incremental:
-        incremental = True
-    elif args.full:
-        incremental = False
-    
-    # Определение режима отладки
-    debug_mode = True
-    if args.debug:
-        debug_mode = True
-    elif args.no_debug:
-        debug_mode = False
-    
-    # Запуск тестирования
-    test_review_parsing(test_url, max_reviews, incremental, debug_mode)
-    test_screenshot() 
\ No newline at end of file
+    # Запуск тестирования. Диагностический скриншот нужен, когда парсинг не удался,
+    # или по флагу --inspect; он делается в уже запущенном браузере парсера
+    review_parser = OzonReviewParser(debug_mode=debug_mode)
+    try:
+        success = test_review_parsing(test_url, max_reviews, incremental, debug_mode, parser=review_parser)
+        if (args.inspect or not success) and review_parser._ensure_browser():
+            test_screenshot(browser=review_parser.browser, debug_mode=debug_mode)
+    finally:
+        review_parser.close() 
\ No newline at end of file